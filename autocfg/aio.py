@@ -0,0 +1,64 @@
+"""Asyncio support, running blocking config file I/O and parsing off the event loop."""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = ['set_max_workers', 'run_io', 'load_many', 'save_many']
+
+_MAX_WORKERS = 8
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def set_max_workers(max_workers):
+    """Set the number of threads running config I/O concurrently, default is 8."""
+    global _MAX_WORKERS, _EXECUTOR
+    with _EXECUTOR_LOCK:
+        old, _EXECUTOR = _EXECUTOR, None
+        _MAX_WORKERS = max_workers
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def _get_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix='autocfg-io')
+        return _EXECUTOR
+
+
+async def run_io(fn, *args, **kwargs):
+    """Run blocking `fn(*args, **kwargs)` in the bounded config I/O executor."""
+    try:
+        loop = asyncio.get_running_loop()
+    except AttributeError:
+        # python 3.6
+        loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def _limited(semaphore, coro):
+    if semaphore is None:
+        return await coro
+    async with semaphore:
+        return await coro
+
+
+async def load_many(cls, files, limit=None, return_exceptions=False):
+    """Load configs of `cls` from all `files` concurrently, with at most `limit` in flight.
+
+    Results are in the order of `files`. With `return_exceptions=True`,
+    failed loads are returned as their exceptions instead of raising.
+    """
+    semaphore = asyncio.Semaphore(limit) if limit else None
+    return await asyncio.gather(*(_limited(semaphore, cls.aload(f)) for f in files),
+                                return_exceptions=return_exceptions)
+
+
+async def save_many(pairs, limit=None, return_exceptions=False):
+    """Save each `(cfg, file)` in `pairs` concurrently, with at most `limit` in flight."""
+    semaphore = asyncio.Semaphore(limit) if limit else None
+    return await asyncio.gather(*(_limited(semaphore, cfg.asave(f)) for cfg, f in pairs),
+                                return_exceptions=return_exceptions)
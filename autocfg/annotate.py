@@ -4,7 +4,23 @@ import typing
 
 @dataclass
 class AnnotateField:
+    """Type of a field with version markers and optional search space.
+
+    `choices` declares a categorical space, `low` and `high` an inclusive
+    range, which is log-uniform if `log` is True. Spaces are used by
+    `sample` to draw configs, see `autocfg.sampling`.
+
+    For array fields (`numpy.ndarray`, `array.array` or `memoryview`),
+    `dtype` and `shape` are checked on assignment, `None` in `shape`
+    matches any size of that dimension.
+    """
     type : typing.Any
     added : typing.Union[str, None] = None
     deprecated : typing.Union[str, None] = None
     deleted : typing.Union[str, None] = None
+    choices : typing.Union[typing.Sequence, None] = None
+    low : typing.Union[int, float, None] = None
+    high : typing.Union[int, float, None] = None
+    log : bool = False
+    dtype : typing.Any = None
+    shape : typing.Union[typing.Tuple, None] = None
@@ -0,0 +1,169 @@
+"""Columnar in-memory store for populations of configs of one class."""
+import numpy as np
+from .dataclasses import flatten_fields, iter_items, unflatten_dict
+
+__all__ = ['ColumnStore']
+
+_DTYPES = {bool: np.bool_, int: np.int64, float: np.float64, str: np.str_}
+
+
+class ColumnStore:
+    """Store many instances of one autocfg class as typed columns.
+
+    Every leaf field is flattened into a column named by its dotted path,
+    e.g. 'optimizer.lr'. Fields annotated as `bool`, `int`, `float` or `str`
+    are backed by NumPy arrays of native dtype, the unicode width of `str`
+    columns grows as needed. Everything else is backed by object arrays.
+
+    Parameters
+    ----------
+    cls : type
+        The autocfg dataclass of the stored configs.
+    capacity : int, optional, default is 16
+        Number of rows to preallocate, grows automatically on append.
+    """
+    def __init__(self, cls, capacity=16):
+        self.cls = cls
+        self._types = {name: ftype for name, ftype, _ in flatten_fields(cls)}
+        self._columns = {name: np.empty(max(capacity, 1), dtype=_DTYPES.get(ftype, object))
+                         for name, ftype in self._types.items()}
+        self._size = 0
+
+    @classmethod
+    def from_columns(cls, klass, columns):
+        """Create store from {dotted_name: array} with equal lengths, values are not re-validated."""
+        store = cls(klass, capacity=1)
+        sizes = {len(v) for v in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError(f'Columns have different lengths: {sizes}')
+        if set(columns) != set(store._types):
+            raise KeyError(f'Columns {set(columns) ^ set(store._types)} do not match fields of {klass}')
+        for name, values in columns.items():
+            dtype = store._columns[name].dtype
+            if dtype == object:
+                store._columns[name] = _object_array(values)
+            else:
+                # infer the width of unicode columns
+                store._columns[name] = np.asarray(values, dtype=np.str_ if dtype.kind == 'U' else dtype)
+        store._size = sizes.pop() if sizes else 0
+        return store
+
+    @property
+    def names(self):
+        return list(self._columns.keys())
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, size):
+        capacity = len(next(iter(self._columns.values()), ()))
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, col in self._columns.items():
+            new_col = np.empty(capacity, dtype=col.dtype)
+            new_col[:self._size] = col[:self._size]
+            self._columns[name] = new_col
+
+    def append(self, cfg):
+        """Append a config instance as a new row."""
+        if not isinstance(cfg, self.cls):
+            raise TypeError(f'{self.__class__.__name__} requires {self.cls}, given {type(cfg)}')
+        self._reserve(self._size + 1)
+        for name, value in iter_items(cfg):
+            col = self._columns.get(name, None)
+            # not annotated fields registered after the store was created have no column
+            if col is None:
+                continue
+            if col.dtype.kind == 'U' and len(value) > col.dtype.itemsize // 4:
+                col = self._widen(name, len(value))
+            col[self._size] = value
+        self._size += 1
+
+    def _widen(self, name, width):
+        col = self._columns[name]
+        col = col.astype(f'U{max(width, 2 * (col.dtype.itemsize // 4))}')
+        self._columns[name] = col
+        return col
+
+    def extend(self, cfgs):
+        for cfg in cfgs:
+            self.append(cfg)
+
+    def column(self, name):
+        """Return a read-only view of column `name`."""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        return self.row(key)
+
+    def row(self, index):
+        """Materialize row `index` as a validated instance of `cls`."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(f'row {index} out of range for {self._size} rows')
+        flat = {name: _to_python(col[index]) for name, col in self._columns.items()}
+        return self.cls(**unflatten_dict(flat))
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self.row(i)
+
+    def take(self, indices):
+        """Return a new store with rows selected by integer indices or boolean mask."""
+        columns = {name: col[:self._size][indices] for name, col in self._columns.items()}
+        return self.from_columns(self.cls, columns)
+
+    def filter(self, mask):
+        """Return a new store with rows where boolean `mask` is True.
+
+        Example: `store.filter(store['optimizer.lr'] < 1e-3)`
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (self._size,):
+            raise ValueError(f'mask of shape {mask.shape} does not match {self._size} rows')
+        return self.take(mask)
+
+    def argsort(self, name, reverse=False):
+        order = np.argsort(self.column(name), kind='stable')
+        return order[::-1] if reverse else order
+
+    def sort(self, name, reverse=False):
+        """Return a new store sorted by column `name`."""
+        return self.take(self.argsort(name, reverse=reverse))
+
+    def save(self, f):
+        """Save all columns to a single `.npz` file."""
+        np.savez(f, **{name: col[:self._size] for name, col in self._columns.items()})
+
+    @classmethod
+    def load(cls, klass, f, allow_pickle=False):
+        """Load store of `klass` configs from `.npz` file saved by `save`.
+
+        Object columns, i.e. fields not of type `bool`, `int`, `float` or `str`,
+        are pickled and require `allow_pickle=True`. Only unpickle trusted files,
+        as loading them can execute arbitrary code.
+        """
+        with np.load(f, allow_pickle=allow_pickle) as data:
+            columns = {name: data[name] for name in data.files}
+        return cls.from_columns(klass, columns)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.cls.__name__}, rows={self._size}, columns={self.names})'
+
+
+def _object_array(values):
+    # np.asarray would turn a column of tuples into a 2-D array
+    arr = np.empty(len(values), dtype=object)
+    for i, v in enumerate(values):
+        arr[i] = v
+    return arr
+
+
+def _to_python(value):
+    return value.item() if isinstance(value, np.generic) else value
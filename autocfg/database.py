@@ -0,0 +1,196 @@
+"""Memory-mapped on-disk database of configs of one class."""
+import array
+import io
+import os
+import json
+import mmap
+import sys
+from .annotate import AnnotateField
+from .dataclasses import flatten_fields, get_path
+
+__all__ = ['ConfigDB']
+
+
+class ConfigDB:
+    """Append-only file of config records with a field path/value index.
+
+    Records are encoded by the class's own `save`/`load` and stored back to
+    back in `path`. Each committed record appends one JSON line to
+    `path + '.idx'` with its offset, length and the values of the indexed
+    fields. Readers map the record file with `mmap` so many processes share
+    the same pages, and only decode a record when it is requested.
+
+    Only one writer may append at a time, any number of readers may call
+    `refresh` to pick up newly committed records.
+
+    Classes with array fields are rejected, as their arrays are saved to
+    sidecar files next to a config file, which records have not.
+
+    Parameters
+    ----------
+    path : str
+        The record file, created in 'a' mode if not existing.
+    cls : type
+        The autocfg dataclass of the stored configs.
+    index : iterable of str, optional
+        Dotted field names to index, e.g. ('optimizer.lr',). Required when
+        creating a new database, read from the existing index otherwise.
+    mode : str, optional, default is 'r'
+        'r' for read-only, 'a' to allow `append`.
+    """
+    def __init__(self, path, cls, index=None, mode='r'):
+        if mode not in ('r', 'a'):
+            raise ValueError(f'mode must be one of ("r", "a"), given {mode}')
+        for name, _, f in flatten_fields(cls):
+            if _is_array_field(f):
+                raise TypeError(f'{self.__class__.__name__} does not support array field `{name}` of {cls}')
+        self.path = path
+        self.cls = cls
+        self.mode = mode
+        self._index_path = path + '.idx'
+        if not os.path.exists(self._index_path):
+            if mode == 'r':
+                raise FileNotFoundError(f'{self._index_path} does not exist')
+            valid_names = {name for name, _, _ in flatten_fields(cls)}
+            index = list(index or ())
+            for name in index:
+                if name not in valid_names:
+                    raise KeyError(f'{name} is not a valid field of {cls}')
+            open(path, 'ab').close()
+            with open(self._index_path, 'w') as fo:
+                fo.write(json.dumps({'class': cls.__name__, 'index': index}) + '\n')
+        self._fi = open(self._index_path, 'r')
+        header = json.loads(self._fi.readline())
+        if index is not None and list(index) != header['index']:
+            raise ValueError(f'{path} is indexed on {header["index"]}, given {list(index)}')
+        self.index_names = header['index']
+        self._offsets = []
+        self._index = {name: {} for name in self.index_names}
+        # readers only go through the memory map
+        self._data = open(path, 'ab') if mode == 'a' else None
+        self._mmap = None
+        self._mmap_size = 0
+        self.refresh()
+
+    def refresh(self):
+        """Load records committed since the last refresh and remap the record file."""
+        while True:
+            pos = self._fi.tell()
+            line = self._fi.readline()
+            if not line.endswith('\n'):
+                # not yet completely written
+                self._fi.seek(pos)
+                break
+            entry = json.loads(line)
+            record_id = len(self._offsets)
+            self._offsets.append((entry['offset'], entry['length']))
+            for name, value in entry['keys'].items():
+                self._index[name].setdefault(_hashable(value), []).append(record_id)
+        if self._offsets:
+            size = sum(self._offsets[-1])
+            if size > self._mmap_size:
+                self._remap(size)
+
+    def _remap(self, size):
+        if self._mmap is not None:
+            self._mmap.close()
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmap_size = size
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def append(self, cfg):
+        """Append `cfg` and return its record id."""
+        if self.mode != 'a':
+            raise io.UnsupportedOperation(f'{self.path} is opened read-only')
+        if not isinstance(cfg, self.cls):
+            raise TypeError(f'{self.__class__.__name__} requires {self.cls}, given {type(cfg)}')
+        f = io.StringIO()
+        cfg.save(f)
+        data = f.getvalue().encode('utf-8')
+        keys = {name: get_path(cfg, name) for name in self.index_names}
+        offset = self._data.seek(0, os.SEEK_END)
+        self._data.write(data)
+        self._data.flush()
+        # the record is committed once its index line is written
+        with open(self._index_path, 'a') as fo:
+            fo.write(json.dumps({'offset': offset, 'length': len(data), 'keys': keys}) + '\n')
+        self.refresh()
+        return len(self._offsets) - 1
+
+    def raw(self, i):
+        """Return the encoded bytes of record `i` as a zero-copy memoryview of the mapped file.
+
+        The view must be released before the next `refresh` remaps the file.
+        """
+        offset, length = self._offsets[i]
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def get(self, i):
+        """Decode record `i` into an instance of `cls`."""
+        with self.raw(i) as buf:
+            return self.cls.load(io.StringIO(str(buf, 'utf-8')))
+
+    def __getitem__(self, i):
+        return self.get(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get(i)
+
+    def find(self, name, value):
+        """Return ids of records whose indexed field `name` equals `value`."""
+        try:
+            index = self._index[name]
+        except KeyError:
+            raise KeyError(f'{name} is not indexed, indexed fields are {self.index_names}')
+        return list(index.get(_hashable(value), []))
+
+    def query(self, conditions):
+        """Return sorted ids of records matching all {dotted_name: value} in `conditions`."""
+        ids = None
+        for name, value in conditions.items():
+            found = set(self.find(name, value))
+            ids = found if ids is None else ids & found
+        return sorted(ids) if ids is not None else list(range(len(self)))
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._data is not None:
+            self._data.close()
+        self._fi.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.path}, {self.cls.__name__}, records={len(self)})'
+
+
+def _hashable(value):
+    # json turns tuples into lists
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    return value
+
+
+def _is_array_field(f):
+    if isinstance(f.type, AnnotateField):
+        if f.type.dtype is not None or f.type.shape is not None:
+            return True
+        field_type = f.type.type
+    else:
+        field_type = f.type
+    if not isinstance(field_type, type):
+        return False
+    np = sys.modules.get('numpy', None)
+    return issubclass(field_type, (array.array, memoryview)) or (np is not None and issubclass(field_type, np.ndarray))
@@ -4,14 +4,22 @@ from typing import *
 import copy
 import json
 import argparse
+import array
+import glob
+import os
+import sys
 from distutils.version import LooseVersion
 import warnings
+import weakref
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import yaml
 from dataclasses import dataclass as _dataclass
 from dataclasses import is_dataclass, asdict, fields, _MISSING_TYPE, _FIELD, make_dataclass
 from dataclasses import field, FrozenInstanceError
 from .annotate import AnnotateField
-from .type_check import is_instance
+from .type_check import is_instance, compile_check, is_array, check_array
+from .aio import run_io
 
 __all__ = ['dataclass', 'field', 'FrozenInstanceError']
 
@@ -59,6 +67,7 @@ def dataclass(*args, **kwargs):
 
         def __init__(self, *args, **kwargs):
             self.__version_annotation__ = {}
+            self.__dirty_fields__ = set()
             self._frozen = False
             for name, value in kwargs.items():
                 # getting field type
@@ -89,6 +98,8 @@ def dataclass(*args, **kwargs):
                 self.__dataclass_fields__[k].type = Any
                 self.__dataclass_fields__[k].name = k
                 self.__dataclass_fields__[k]._field_type = _FIELD
+            # freshly constructed instance is clean
+            self.__dirty_fields__.clear()
 
         def __getattribute__(self, name):
             annotation = None
@@ -133,15 +144,24 @@ def dataclass(*args, **kwargs):
                     required_type = required_type.type
                 if not allow_type_change and not is_instance(value, required_type):
                     raise TypeError(f'`{self.__class__}.{name}` requires {required_type}, given {type(value)}:{value}')
+                if not allow_type_change:
+                    _check_array_spec(self.__class__, name, field_def.type, value)
             o___setattr__(self, name, value)
+            if field_def is not None:
+                _mark_dirty(self, name)
 
         # injecting methods
         klass.__init__=__init__
         klass.get = _get
         klass.save = _save
         klass.load = _load
+        klass.load_dir = _load_dir
+        klass.aload = _aload
+        klass.asave = _asave
+        klass.aupdate = _aupdate
         klass.__auto_version__ = _version
-        klass.asdict = asdict
+        klass.asdict = _asdict
+        klass.iter_items = iter_items
         klass.__getattribute__ = __getattribute__
         klass.__setattr__ = __setattr__
         klass.__repr__ = __repr__
@@ -149,55 +169,155 @@ def dataclass(*args, **kwargs):
         klass.update = _update
         klass.merge = _merge
         klass.diff = _diff
+        klass.sample = _sample
+        klass.from_records = _from_records
+        klass.update_many = _update_many
         klass.freeze = _freeze
+        klass.dirty_fields = _dirty_fields
+        klass.save_delta = _save_delta
+        klass.compact = _compact
         klass.unfreeze = _unfreeze
+        klass.validate_dict = _validate_dict
+        klass.json_schema = _json_schema
+        klass.resolve = _resolve
+        klass.__auto_fields__ = tuple(auto_annotate_fields)
         return klass
 
     return wrapper(args[0], version=_version) if args else wrapper
 
 def __post_init__(self):
+    _annotate_versions(self)
     for field_name, field_def in self.__dataclass_fields__.items():
-        actual_value = getattr(self, field_name)
+        # bypass __getattribute__ to not warn about deprecated fields during init
+        actual_value = object.__getattribute__(self, field_name)
         required_type = field_def.type
         if isinstance(required_type, AnnotateField):
-            # check versions
-            auto_version = LooseVersion(self.__auto_version__)
-            added_version = LooseVersion(required_type.added if required_type.added else '0.0')
-            if added_version > auto_version:
-                self.__version_annotation__[field_name] = {
-                    'mark': 'not_added',
-                    'message': f'`{self.__class__}.{field_name}` is not added in version {self.__auto_version__}'
-                }
-                continue
-            deprecated_version = LooseVersion(required_type.deprecated if required_type.deprecated else '999.0')
-            deleted_version = LooseVersion(required_type.deleted if required_type.deleted else '999.0')
-            if deprecated_version <= auto_version < deleted_version:
-                self.__version_annotation__[field_name] = {
-                    'mark': 'deprecated',
-                    'message': f'`{self.__class__}.{field_name}` is deprecated in {deprecated_version} ' +
-                        f'and will be deleted in {deleted_version}, current is {auto_version}'
-                }
-            elif deleted_version <= auto_version:
-                self.__version_annotation__[field_name] = {
-                    'mark': 'deleted',
-                    'message': f'`{self.__class__}.{field_name}` is deleted in {deleted_version} in {self.__class__}' +
-                        f', current is {auto_version}'
-                }
-                continue
             required_type = required_type.type
         if not is_instance(actual_value, required_type):
             raise TypeError(f'`{self.__class__}.{field_name}` requires {required_type},' +
                 ' given {type(actual_value)}:{actual_value}')
-
-    for k, v in self.__version_annotation__.items():
+        _check_array_spec(self.__class__, field_name, field_def.type, actual_value)
+
+def _annotate_versions(self):
+    """Mark not added, deprecated and deleted fields, and remove the unavailable ones."""
+    plan = _version_plan(self.__class__)
+    if not plan:
+        return
+    self.__version_annotation__.update(plan)
+    for k, v in plan.items():
         if v.get('mark', '') != 'deprecated':
             self.__dataclass_fields__.pop(k, None)
 
+_VERSION_PLANS = weakref.WeakKeyDictionary()
+
+def _version_plan(cls):
+    """Version annotations of fields in `cls`, computed once per class."""
+    try:
+        return _VERSION_PLANS[cls]
+    except KeyError:
+        pass
+    plan = {}
+    for field_name, field_def in cls.__dataclass_fields__.items():
+        required_type = field_def.type
+        if not isinstance(required_type, AnnotateField):
+            continue
+        auto_version = LooseVersion(cls.__auto_version__)
+        added_version = LooseVersion(required_type.added if required_type.added else '0.0')
+        if added_version > auto_version:
+            plan[field_name] = {
+                'mark': 'not_added',
+                'message': f'`{cls}.{field_name}` is not added in version {cls.__auto_version__}'
+            }
+            continue
+        deprecated_version = LooseVersion(required_type.deprecated if required_type.deprecated else '999.0')
+        deleted_version = LooseVersion(required_type.deleted if required_type.deleted else '999.0')
+        if deprecated_version <= auto_version < deleted_version:
+            plan[field_name] = {
+                'mark': 'deprecated',
+                'message': f'`{cls}.{field_name}` is deprecated in {deprecated_version} ' +
+                    f'and will be deleted in {deleted_version}, current is {auto_version}'
+            }
+        elif deleted_version <= auto_version:
+            plan[field_name] = {
+                'mark': 'deleted',
+                'message': f'`{cls}.{field_name}` is deleted in {deleted_version} in {cls}' +
+                    f', current is {auto_version}'
+            }
+    _VERSION_PLANS[cls] = plan
+    return plan
+
+def _removed_fields(cls):
+    """Names of fields of `cls` not available in its version, i.e. not added or deleted."""
+    return {k for k, v in _version_plan(cls).items() if v['mark'] != 'deprecated'}
+
+def _build_trusted(cls, values):
+    """Construct `cls` from complete and already validated field values, skipping type checks."""
+    self = object.__new__(cls)
+    object.__setattr__(self, '__version_annotation__', {})
+    object.__setattr__(self, '__dirty_fields__', set())
+    object.__setattr__(self, '_frozen', False)
+    for k, v in values.items():
+        object.__setattr__(self, k, v)
+    _annotate_versions(self)
+    return self
+
+def _asdict(self, copy=True):
+    """Return fields as nested dict.
+
+    With `copy=False`, sub-configs are converted to dicts, also inside lists,
+    tuples and dicts, but all other values are the objects held by the config
+    rather than deep copies, so the result must not be modified.
+    """
+    if copy:
+        return asdict(self)
+    return {name: _asdict_value(value) for name, value in iter_items(self, flat=False)}
+
+def _asdict_value(value):
+    """Convert sub-configs in `value` like `asdict`, containers without any are returned as is."""
+    if is_dataclass_instance(value):
+        return _asdict(value, copy=False)
+    if isinstance(value, (list, tuple)):
+        items = [_asdict_value(v) for v in value]
+        if all(a is b for a, b in zip(items, value)):
+            return value
+        # namedtuple is constructed from positional arguments
+        return type(value)(*items) if hasattr(value, '_fields') else type(value)(items)
+    if isinstance(value, dict):
+        items = [(_asdict_value(k), _asdict_value(v)) for k, v in value.items()]
+        if all(k is k0 and v is v0 for (k, v), (k0, v0) in zip(items, value.items())):
+            return value
+        return type(value)(items)
+    return value
+
+class _Dumper(yaml.Dumper):
+    """Dumper writing values shared by several fields in full, without anchors and aliases."""
+    def ignore_aliases(self, data):
+        return True
+
+def iter_items(self, flat=True, prefix=''):
+    """Lazily yield `(name, value)` of all fields without copying.
+
+    With `flat=True`, sub-configs are descended into and names are dotted
+    like 'xxx.yyy.zzz', otherwise sub-configs are yielded as values.
+    """
+    for f in fields(self):
+        value = getattr(self, f.name)
+        name = prefix + f.name
+        if flat and is_dataclass_instance(value):
+            yield from iter_items(value, flat=True, prefix=name + '.')
+        else:
+            yield name, value
+
 def _get(self, name, default=None):
     return getattr(self, name, default)
 
 def _save(self, f):
-    d = asdict(self)
+    if _has_arrays(self):
+        if not isinstance(f, str):
+            raise ValueError(f'{self.__class__.__name__} has array fields, which can only be saved to a file path')
+        d = _externalize_arrays(self, f)
+    else:
+        d = _asdict(self, copy=False)
     if isinstance(f, str):
         if f.endswith('.json'):
             with open(f, 'w') as fo:
@@ -205,15 +325,151 @@ def _save(self, f):
         elif f.endswith('.yaml') or f.endswith('.yml'):
             with open(f, 'w') as fo:
                 fo.write(f'# {self.__class__.__name__}\n')
-                yaml.dump(d, fo)
+                yaml.dump(d, fo, Dumper=_Dumper)
         else:
             raise ValueError('{} is not one of supported types: {}'.format(f, ('.json', '.yml', '.yaml')))
     else:
         # file-like
-        yaml.dump(d, f)
+        yaml.dump(d, f, Dumper=_Dumper)
+
+_ARRAY_KEY = '__array__'
+
+def _has_arrays(self):
+    for f in fields(self):
+        value = getattr(self, f.name)
+        if is_array(value) or (is_dataclass_instance(value) and _has_arrays(value)):
+            return True
+    return False
+
+def _externalize_arrays(self, f, prefix=''):
+    """Like `asdict`, but array values are saved to sidecar .npy files next to `f` and replaced by references."""
+    d = {}
+    for fd in fields(self):
+        value = getattr(self, fd.name)
+        name = prefix + fd.name
+        if is_dataclass_instance(value):
+            d[fd.name] = _externalize_arrays(value, f, name + '.')
+        elif is_array(value):
+            d[fd.name] = _save_array(value, f, name)
+        else:
+            d[fd.name] = _asdict_value(value)
+    return d
+
+def _save_array(value, f, name):
+    import numpy as np
+    sidecar = f'{os.path.splitext(f)[0]}.{name}.npy'
+    dirname, basename = os.path.split(sidecar)
+    tmp = os.path.join(dirname, '.tmp-' + basename)
+    with open(tmp, 'wb') as fo:
+        np.save(fo, np.asarray(value))
+    # replace instead of overwrite, the old file may still be memory-mapped
+    os.replace(tmp, sidecar)
+    ref = {_ARRAY_KEY: basename, 'kind': 'ndarray'}
+    if isinstance(value, array.array):
+        ref.update({'kind': 'array', 'typecode': value.typecode})
+    elif isinstance(value, memoryview):
+        ref['kind'] = 'memoryview'
+    return ref
+
+def _resolve_arrays(d, f):
+    """Replace sidecar references in dict `d` read from file `f` with memory-mapped arrays."""
+    for k, v in d.items():
+        if isinstance(v, dict):
+            if _ARRAY_KEY in v:
+                d[k] = _load_array(v, f)
+            else:
+                _resolve_arrays(v, f)
+
+def _load_array(ref, f):
+    import numpy as np
+    path = os.path.join(os.path.dirname(f), ref[_ARRAY_KEY])
+    try:
+        arr = np.load(path, mmap_mode='r')
+    except ValueError:
+        # empty arrays can not be memory-mapped
+        arr = np.load(path)
+    kind = ref.get('kind', 'ndarray')
+    if kind == 'memoryview':
+        return memoryview(arr)
+    if kind == 'array':
+        # array.array always owns its buffer
+        arr_copy = array.array(ref['typecode'])
+        arr_copy.frombytes(memoryview(np.ascontiguousarray(arr)).cast('B'))
+        return arr_copy
+    return arr
 
 @classmethod
-def _load(cls, f):
+def _load(cls, f, deltas=None):
+    """Load config from file or file-like `f`, then replay patches from log `deltas` if existing."""
+    cfg = cls(**_read_dict(f))
+    if deltas is not None and os.path.exists(deltas):
+        for patch in _read_deltas(deltas):
+            _resolve_arrays(patch, deltas)
+            cfg.update(patch)
+        _clear_dirty(cfg)
+    return cfg
+
+@classmethod
+async def _aload(cls, f, deltas=None):
+    """Asynchronous `load`, file I/O, parsing and validation run in the `autocfg.aio` executor."""
+    return await run_io(cls.load, f, deltas=deltas)
+
+async def _asave(self, f):
+    """Asynchronous `save` in the `autocfg.aio` executor, do not modify the config until it returns."""
+    return await run_io(self.save, f)
+
+LoadResult = namedtuple('LoadResult', ['path', 'config', 'error'])
+
+@classmethod
+def _load_dir(cls, path, workers=None):
+    """Load all config files in a directory or matching a glob pattern.
+
+    Files are parsed in a pool of `workers` processes, default is the number
+    of CPUs, `workers=1` parses in the current process. The configs are
+    constructed in the current process and yielded as
+    `LoadResult(path, config, error)` sorted by path. A file that fails to
+    parse or validate is yielded with `config=None` and the exception as
+    `error`, without aborting the others.
+    """
+    if os.path.isdir(path):
+        files = [f for ext in ('*.yaml', '*.yml', '*.json') for f in glob.glob(os.path.join(path, ext))]
+    else:
+        files = glob.glob(path)
+    files = sorted(files)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(files) > 1:
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for f, parsed in zip(files, executor.map(_try_read_dict, files, chunksize=chunksize)):
+                yield _try_construct(cls, f, parsed)
+    else:
+        for f in files:
+            yield _try_construct(cls, f, _try_read_dict(f))
+
+def _try_read_dict(f):
+    try:
+        # arrays are mapped in the constructing process, not copied from the parsing one
+        return _read_dict(f, resolve_arrays=False), None
+    except Exception as e:
+        return None, e
+
+def _try_construct(cls, f, parsed):
+    d, error = parsed
+    if error is None:
+        try:
+            _resolve_arrays(d, f)
+            return LoadResult(f, cls(**d), None)
+        except Exception as e:
+            error = e
+    return LoadResult(f, None, error)
+
+def _read_dict(f, resolve_arrays=True):
+    """Parse config file or file-like `f` into a nested dict without constructing any config.
+
+    Sidecar array references in file `f` are replaced with the memory-mapped
+    arrays, unless `resolve_arrays=False`.
+    """
     if isinstance(f, str):
         if f.endswith('.json'):
             with open(f, 'r') as fi:
@@ -228,7 +484,9 @@ def _load(cls, f):
         d = yaml.load(f.getvalue(), Loader=yaml.FullLoader)
     if not d:
         raise ValueError(f'Unable to load from {f}')
-    return cls(**d)
+    if resolve_arrays and isinstance(f, str):
+        _resolve_arrays(d, f)
+    return d
 
 @classmethod
 def _parse_args(cls, args=None, namespace=None):
@@ -236,18 +494,7 @@ def _parse_args(cls, args=None, namespace=None):
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     _parse_args_impl(cls, parser, None)
     args = vars(parser.parse_args(args=args, namespace=namespace))
-    # convert to nested dict from 'xxx.yyy.zzz'
-    new_args = {}
-    for k, v in args.items():
-        ks = k.split('.')
-        d = {}
-        _d = new_args
-        for i, key in enumerate(ks[:-1]):
-            if key not in _d:
-                _d[key] = {}
-            _d = _d[key]
-        _d.update({ks[-1]: v})
-    return cls(**new_args)
+    return cls(**unflatten_dict(args))
 
 def _parse_args_impl(cls, parser, prefix):
     if prefix is None:
@@ -269,6 +516,146 @@ def _parse_args_impl(cls, parser, prefix):
             parser.add_argument(mangle_name('.'.join(new_prefix)),
                                 type=value_or_class, default=default, help=field.name)
 
+@classmethod
+def _sample(cls, n, seed=None, as_columns=False):
+    """Draw `n` configs from the search spaces declared by `AnnotateField`, see `autocfg.sampling.sample`."""
+    from .sampling import sample
+    return sample(cls, n, seed=seed, as_columns=as_columns)
+
+@classmethod
+def _validate_dict(cls, d, strict=False):
+    """Check the raw nested dict `d` without constructing anything, see `autocfg.schema.Schema.validate`."""
+    from .schema import compile_schema
+    return compile_schema(cls).validate(d, strict=strict)
+
+@classmethod
+def _json_schema(cls):
+    """Export the JSON Schema of the dict accepted by `cls(**d)`."""
+    from .schema import compile_schema
+    return compile_schema(cls).to_json_schema()
+
+@classmethod
+def _resolve(cls, sources):
+    """Construct from ordered layers of sources once, see `autocfg.layered.resolve`."""
+    from .layered import resolve
+    return resolve(cls, sources)
+
+@classmethod
+def _from_records(cls, records):
+    """Construct a list of instances from an iterable of (nested) dicts.
+
+    Equivalent to `[cls(**d) for d in records]`, but the fields are resolved
+    once and every field is validated column-wise over all records before the
+    instances are created without further checks.
+    """
+    records = list(records)
+    plan = _version_plan(cls)
+    columns = {}
+    for f in fields(cls):
+        if plan.get(f.name, {}).get('mark', 'deprecated') != 'deprecated':
+            continue
+        required_type = f.type.type if isinstance(f.type, AnnotateField) else f.type
+        values = [r[f.name] if f.name in r else _default_value(cls, f) for r in records]
+        if is_dataclass(required_type):
+            idx = [i for i, v in enumerate(values) if isinstance(v, dict)]
+            for i, obj in zip(idx, required_type.from_records([values[i] for i in idx])):
+                values[i] = obj
+        _check_column(cls, f.name, f.type, values)
+        columns[f.name] = values
+    # not annotated fields are only registered by the first `cls(...)`
+    for k in getattr(cls, '__auto_fields__', ()):
+        if k not in columns:
+            columns[k] = [r[k] if k in r else getattr(cls, k) for r in records]
+    unexpected = {k for r in records for k in r} - set(columns) - set(cls.__annotations__)
+    for k in unexpected:
+        warnings.warn(f'Unexpected `{k}` in {cls.__name__}')
+    names = list(columns.keys())
+    return [_build_trusted(cls, dict(zip(names, row))) for row in zip(*columns.values())] \
+        if names else [_build_trusted(cls, {}) for _ in records]
+
+@classmethod
+def _update_many(cls, instances, records, allow_type_change=False):
+    """Update each of `instances` with the (nested) dict at the same position in `records`.
+
+    Like calling `update(record)` on every instance, with every updated field,
+    nested ones included, validated column-wise in one pass before any value
+    is assigned.
+    """
+    assignments = []
+    _plan_update_many(cls, list(instances), list(records), allow_type_change, assignments)
+    for objs, name, values in assignments:
+        for obj, v in zip(objs, values):
+            object.__setattr__(obj, name, v)
+            _mark_dirty(obj, name)
+
+def _plan_update_many(cls, instances, records, allow_type_change, assignments):
+    """Validate `update_many` and collect `(instances, name, values)` to assign, recursing into nested dicts."""
+    if len(instances) != len(records):
+        raise ValueError(f'{len(instances)} instances but {len(records)} records')
+    for obj in instances:
+        if not isinstance(obj, cls):
+            raise TypeError(f'{cls.__name__}.update_many requires {cls}, given {type(obj)}')
+        if getattr(obj, '_frozen', False):
+            raise FrozenInstanceError(f'Attempted to update a frozen instance. Call `unfreeze` if this is intended.')
+    names = list(dict.fromkeys(k for r in records for k in r))
+    nested = []
+    for name in names:
+        f = cls.__dataclass_fields__.get(name, None)
+        if f is None:
+            raise KeyError(f'{name} is not a valid key in {cls}')
+        required_type = f.type.type if isinstance(f.type, AnnotateField) else f.type
+        idx = [i for i, r in enumerate(records) if name in r]
+        old_values = [getattr(instances[i], name) for i in idx]
+        values = [records[i][name] for i in idx]
+        if is_dataclass(required_type):
+            sub = [(old_v, v) for old_v, v in zip(old_values, values) if isinstance(v, dict)]
+            if sub:
+                nested.append((required_type, sub))
+            keep = [j for j, v in enumerate(values) if not isinstance(v, dict)]
+            idx = [idx[j] for j in keep]
+            old_values = [old_values[j] for j in keep]
+            values = [values[j] for j in keep]
+        # special relaxation, tuple <-> list is interchanable
+        values = [list(v) if isinstance(old_v, list) and isinstance(v, tuple) else
+                  tuple(v) if isinstance(old_v, tuple) and isinstance(v, list) else v
+                  for old_v, v in zip(old_values, values)]
+        if not allow_type_change:
+            _check_column(cls, name, f.type, values)
+        assignments.append(([instances[i] for i in idx], name, values))
+    for klass, pairs in nested:
+        _plan_update_many(klass, [p[0] for p in pairs], [p[1] for p in pairs], allow_type_change, assignments)
+
+def _default_value(cls, f):
+    if not isinstance(f.default, _MISSING_TYPE):
+        return f.default
+    if not isinstance(f.default_factory, _MISSING_TYPE):
+        return f.default_factory()
+    raise TypeError(f'{cls.__name__} missing required argument: `{f.name}`')
+
+def _check_column(cls, name, field_type, values):
+    """Type check all values of field `name` at once."""
+    required_type = field_type.type if isinstance(field_type, AnnotateField) else field_type
+    if isinstance(required_type, type) and required_type.__module__ != 'typing':
+        # plain class, check each distinct type once
+        bad_types = {t for t in set(map(type, values)) if not issubclass(t, required_type)}
+        bad = [v for v in values if type(v) in bad_types]
+    else:
+        check = compile_check(required_type)
+        bad = [v for v in values if not check(v)]
+    if bad:
+        raise TypeError(f'`{cls}.{name}` requires {required_type}, given {type(bad[0])}:{bad[0]}')
+    if isinstance(field_type, AnnotateField) and (field_type.dtype is not None or field_type.shape is not None):
+        for value in values:
+            _check_array_spec(cls, name, field_type, value)
+
+def _check_array_spec(cls, name, field_type, value):
+    """Check dtype and shape declared by `AnnotateField` of array field `name`."""
+    if not isinstance(field_type, AnnotateField) or (field_type.dtype is None and field_type.shape is None):
+        return
+    if not check_array(value, field_type.dtype, field_type.shape):
+        raise TypeError(f'`{cls}.{name}` requires array of dtype {field_type.dtype} and shape {field_type.shape},' +
+            f' given {type(value)} of dtype {getattr(value, "dtype", None)} and shape {getattr(value, "shape", None)}')
+
 def _update(self, other=None, key=None, allow_new_key=False, allow_type_change=False, **kwargs):
     try:
         is_frozen = self._frozen
@@ -284,7 +671,7 @@ def _update(self, other=None, key=None, allow_new_key=False, allow_type_change=F
     elif isinstance(other, str) or hasattr(other, 'getvalue'):
         try:
             o = klass.load(other)
-            udict = o.asdict()
+            udict = o.asdict(copy=False)
         except ValueError:
             raise ValueError(f'Unable to update from {other}')
         _update(self, udict, key=key, allow_new_key=allow_new_key, allow_type_change=allow_type_change)
@@ -320,6 +707,16 @@ def _update(self, other=None, key=None, allow_new_key=False, allow_type_change=F
                         new_v = tuple(new_v)
                     self.__setattr__(k, new_v, allow_type_change=allow_type_change)
 
+async def _aupdate(self, other=None, key=None, allow_new_key=False, allow_type_change=False, **kwargs):
+    """Asynchronous `update`, loading from file or file-like `other` in the `autocfg.aio` executor."""
+    if isinstance(other, str) or hasattr(other, 'getvalue'):
+        try:
+            o = await run_io(self.__class__.load, other)
+        except ValueError:
+            raise ValueError(f'Unable to update from {other}')
+        other = o.asdict(copy=False)
+    self.update(other, key=key, allow_new_key=allow_new_key, allow_type_change=allow_type_change, **kwargs)
+
 def _merge(self, other=None, key=None, allow_new_key=False, allow_type_change=False, **kwargs):
     cfg = copy.deepcopy(self)
     cfg.unfreeze()
@@ -328,15 +725,106 @@ def _merge(self, other=None, key=None, allow_new_key=False, allow_type_change=Fa
 
 def _diff(self, other):
     assert isinstance(other, self.__class__)
-    dd = recursive_compare(self.asdict(), other.asdict())
+    dd = recursive_compare(_asdict(self, copy=False), _asdict(other, copy=False))
     return dd
 
-def _freeze(self):
+def _mark_dirty(self, name):
+    dirty = self.__dict__.get('__dirty_fields__', None)
+    if dirty is not None:
+        dirty.add(name)
+
+def _clear_dirty(self):
+    dirty = self.__dict__.get('__dirty_fields__', None)
+    if dirty is not None:
+        dirty.clear()
+    for f in fields(self):
+        value = self.__dict__.get(f.name, None)
+        if is_dataclass_instance(value):
+            _clear_dirty(value)
+
+def _dirty_fields(self, prefix=''):
+    """Dotted names of fields assigned since construction, load, the last `save_delta` or `compact`."""
+    dirty = self.__dict__.get('__dirty_fields__', ())
+    names = []
+    for f in fields(self):
+        name = prefix + f.name
+        value = self.__dict__.get(f.name, None)
+        if f.name in dirty:
+            names.append(name)
+        elif is_dataclass_instance(value) and hasattr(value, 'dirty_fields'):
+            names.extend(value.dirty_fields(prefix=name + '.'))
+    return names
+
+def _save_delta(self, log, base=None, compact_every=None):
+    """Append the fields changed since the last patch as one YAML document to log file `log`.
+
+    Returns the dotted names of the saved fields. Use `load(base, deltas=log)`
+    to restore. If `base` and `compact_every` are given, the full config is
+    saved to `base` and `log` is emptied once it holds `compact_every` patches.
+    Plain `save` calls do not reset the changed fields, only `save_delta` and
+    `compact` do.
+    """
+    names = self.dirty_fields()
+    if names:
+        # arrays go to sidecar files named by the offset of the patch, unique within the log
+        offset = os.path.getsize(log) if os.path.exists(log) else 0
+        patch = {}
+        for name in names:
+            value = get_path(self, name)
+            if is_dataclass_instance(value):
+                patch[name] = _externalize_arrays(value, log, f'{offset}.{name}.') if _has_arrays(value) \
+                    else _asdict(value, copy=False)
+            elif is_array(value):
+                patch[name] = _save_array(value, log, f'{offset}.{name}')
+            else:
+                patch[name] = _asdict_value(value)
+        # same codec as `save`, so tuples and non-str keys survive the replay
+        with open(log, 'a') as fo:
+            yaml.dump(unflatten_dict(patch), fo, Dumper=_Dumper, explicit_start=True, explicit_end=True)
+        _clear_dirty(self)
+    if base is not None and compact_every:
+        with open(log, 'r') as fi:
+            num_patches = sum(1 for line in fi if line == _DELTA_END)
+        if num_patches >= compact_every:
+            self.compact(base, log)
+    return names
+
+_DELTA_END = '...\n'
+
+def _read_deltas(log):
+    """Yield the patches in log file `log`, a patch is committed once its end marker is written."""
+    with open(log, 'r') as fi:
+        text = fi.read()
+    end = text.rfind('\n' + _DELTA_END)
+    if end < 0:
+        return
+    yield from yaml.load_all(text[:end + 1 + len(_DELTA_END)], Loader=yaml.FullLoader)
+
+def _compact(self, base, log):
+    """Save the full config to `base` and empty patch log `log`."""
+    dirname, basename = os.path.split(base)
+    tmp = os.path.join(dirname, '.tmp-' + basename)
+    self.save(tmp)
+    os.replace(tmp, base)
+    open(log, 'w').close()
+    _clear_dirty(self)
+
+def _freeze(self, recursive=False):
     self._frozen = True
+    if recursive:
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if is_dataclass_instance(value) and hasattr(value, 'freeze'):
+                value.freeze(recursive=True)
     return self
 
-def _unfreeze(self):
+def _unfreeze(self, recursive=False):
     self._frozen = False
+    if recursive:
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if is_dataclass_instance(value) and hasattr(value, 'unfreeze'):
+                value.unfreeze(recursive=True)
     return self
 
 def recursive_compare(d1, d2, level='root', diffs=None):
@@ -363,9 +851,52 @@ def recursive_compare(d1, d2, level='root', diffs=None):
             recursive_compare(d1[i], d2[i], level='{}[{}]'.format(level, i), diffs=diffs)
 
     else:
-        if d1 != d2:
+        if not values_equal(d1, d2):
             diffs.append('{:<20} {} != {}'.format(level, d1, d2))
     return diffs
 
+def values_equal(a, b):
+    """Compare field values, numpy arrays are equal if of same shape and elements."""
+    np = sys.modules.get('numpy', None)
+    if np is not None and (isinstance(a, np.ndarray) or isinstance(b, np.ndarray)):
+        return np.array_equal(a, b)
+    return a == b
+
 def is_dataclass_instance(obj):
     return is_dataclass(obj) and not isinstance(obj, type)
+
+def flatten_fields(cls, prefix=None):
+    """Yield `(dotted_name, type, field)` for each leaf field of `cls`, descending into nested dataclasses."""
+    if prefix is None:
+        prefix = []
+    removed = _removed_fields(cls)
+    for f in fields(cls):
+        if f.name in removed:
+            continue
+        new_prefix = prefix + [f.name]
+        value_or_class = f.type
+        if isinstance(value_or_class, AnnotateField):
+            value_or_class = value_or_class.type
+        if is_dataclass(value_or_class):
+            yield from flatten_fields(value_or_class, new_prefix)
+        else:
+            yield '.'.join(new_prefix), value_or_class, f
+
+def get_path(obj, name):
+    """Get value of dotted field name 'xxx.yyy.zzz' from `obj`."""
+    for key in name.split('.'):
+        obj = getattr(obj, key)
+    return obj
+
+def unflatten_dict(flat):
+    """Convert {'xxx.yyy.zzz': v} to nested dict {'xxx': {'yyy': {'zzz': v}}}."""
+    nested = {}
+    for k, v in flat.items():
+        ks = k.split('.')
+        _d = nested
+        for key in ks[:-1]:
+            if key not in _d:
+                _d[key] = {}
+            _d = _d[key]
+        _d.update({ks[-1]: v})
+    return nested
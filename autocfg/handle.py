@@ -0,0 +1,98 @@
+"""Thread-safe config handle publishing immutable snapshots (read-copy-update)."""
+import copy
+import threading
+from .dataclasses import is_dataclass_instance
+
+__all__ = ['ConfigHandle']
+
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+class ConfigHandle:
+    """Handle to a config shared by reader and writer threads.
+
+    Readers call `snapshot()` and get a frozen config that never changes
+    afterwards, without taking any lock. Writers call `update`, which builds
+    a new version sharing every unchanged sub-config with the current one,
+    validates it and swaps it in atomically. Readers holding an older
+    snapshot keep seeing a consistent, complete config.
+
+    Parameters
+    ----------
+    cfg : autocfg dataclass instance
+        The initial config, which is copied.
+    """
+    def __init__(self, cfg):
+        self._lock = threading.Lock()
+        self._snapshot = copy.deepcopy(cfg).freeze(recursive=True)
+        self._version = 0
+
+    def snapshot(self):
+        """Return the current frozen config."""
+        return self._snapshot
+
+    @property
+    def version(self):
+        """Number of updates published so far."""
+        return self._version
+
+    def update(self, other=None, allow_type_change=False, **kwargs):
+        """Publish a new snapshot with `other` applied, accepts the same input as `update` of the config.
+
+        Returns the new snapshot. Adding new keys is not supported.
+        """
+        with self._lock:
+            current = self._snapshot
+            udict = _update_dict(current, other, kwargs)
+            new = _shared_update(current, udict, allow_type_change)
+            self._snapshot = new
+            self._version += 1
+        return new
+
+    def replace(self, cfg):
+        """Publish a copy of `cfg` as the new snapshot."""
+        new = copy.deepcopy(cfg).freeze(recursive=True)
+        with self._lock:
+            self._snapshot = new
+            self._version += 1
+        return new
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(version={self._version}, {self._snapshot})'
+
+
+def _update_dict(cfg, other, kwargs):
+    klass = cfg.__class__
+    if other is None:
+        return kwargs
+    if isinstance(other, str) or hasattr(other, 'getvalue'):
+        try:
+            return klass.load(other).asdict(copy=False)
+        except ValueError:
+            raise ValueError(f'Unable to update from {other}')
+    if isinstance(other, klass):
+        return {k: getattr(other, k) for k in other.__dataclass_fields__}
+    if isinstance(other, dict):
+        return other
+    raise TypeError(f'Unable to update {klass} from {type(other)}')
+
+
+def _shared_update(cfg, udict, allow_type_change):
+    """Copy of frozen `cfg` with `udict` applied, sharing all sub-configs not in `udict`."""
+    new = copy.copy(cfg)
+    object.__setattr__(new, '_frozen', False)
+    object.__setattr__(new, '__dirty_fields__', set(cfg.__dict__.get('__dirty_fields__', ())))
+    for k, v in udict.items():
+        if not hasattr(cfg, k):
+            raise KeyError(f'{k} is not a valid key in {cfg}')
+        old_v = getattr(cfg, k)
+        if is_dataclass_instance(old_v) and isinstance(v, dict):
+            object.__setattr__(new, k, _shared_update(old_v, v, allow_type_change))
+        elif is_dataclass_instance(v):
+            new.__setattr__(k, copy.deepcopy(v).freeze(recursive=True), allow_type_change=allow_type_change)
+        else:
+            # the snapshot must not share mutable values with the caller
+            if not isinstance(v, _IMMUTABLE_TYPES):
+                v = copy.deepcopy(v)
+            new.update({k: v}, allow_type_change=allow_type_change)
+    return new.freeze()
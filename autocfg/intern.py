@@ -0,0 +1,142 @@
+"""Opt-in interning of identical frozen sub-configs and immutable leaf values."""
+import sys
+import weakref
+from dataclasses import fields
+from .dataclasses import is_dataclass_instance
+from .type_check import _INSTANCE_CACHE
+
+__all__ = ['InternTable', 'intern_config']
+
+_SCALAR_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+class InternTable:
+    """Table of canonical objects shared by equal configs and leaf values.
+
+    Frozen configs whose sub-configs are frozen as well and whose values are
+    all immutable are kept in a weak-value table, so an entry lives as long
+    as some config uses it. Strings are interned with `sys.intern`. Tuples and
+    frozensets cannot be weakly referenced, so they are held until `purge`
+    drops the ones no longer used elsewhere.
+
+    Shared configs must stay frozen, do not `unfreeze` them.
+    """
+    def __init__(self):
+        self._configs = weakref.WeakValueDictionary()
+        self._leaves = {}
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, value):
+        """Return the canonical object equal to `value`, or `value` itself if it can not be shared."""
+        if type(value) is str:
+            return sys.intern(value)
+        if type(value) in (tuple, frozenset):
+            return self._intern_leaf(value)
+        if is_dataclass_instance(value):
+            return self._intern_config(value)
+        return value
+
+    def _intern_leaf(self, value):
+        key = _leaf_key(value)
+        if key is None:
+            return value
+        return self._lookup(self._leaves, key, value)
+
+    def _intern_config(self, cfg):
+        for f in fields(cfg):
+            value = cfg.__dict__.get(f.name, None)
+            shared = self.intern(value)
+            if shared is not value:
+                # equal value, safe to swap even in frozen configs
+                object.__setattr__(cfg, f.name, shared)
+        key = _config_key(cfg)
+        if key is None:
+            return cfg
+        return self._lookup(self._configs, key, cfg)
+
+    def _lookup(self, table, key, value):
+        shared = table.get(key, None)
+        if shared is None:
+            table[key] = value
+            self.misses += 1
+            return value
+        self.hits += 1
+        return shared
+
+    def purge(self):
+        """Drop tuples and frozensets not referenced outside the table, return number dropped."""
+        # one reference from the table, one from getrefcount and those of cached type checks
+        held = _INSTANCE_CACHE.held()
+        unused = [k for k in list(self._leaves)
+                  if sys.getrefcount(self._leaves[k]) <= 2 + held.get(id(self._leaves[k]), 0)]
+        _INSTANCE_CACHE.discard({id(self._leaves[k]) for k in unused})
+        for k in unused:
+            del self._leaves[k]
+        return len(unused)
+
+    def clear(self):
+        self._configs.clear()
+        self._leaves.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'configs': len(self._configs), 'leaves': len(self._leaves)}
+
+    def __len__(self):
+        return len(self._configs) + len(self._leaves)
+
+
+_DEFAULT_TABLE = InternTable()
+
+
+def intern_config(cfg, table=None):
+    """Share equal frozen sub-configs and immutable leaves of `cfg` with previously interned configs.
+
+    Returns the canonical config equal to `cfg`, which is `cfg` itself unless
+    `cfg` is frozen and an equal config has been interned before.
+
+    Parameters
+    ----------
+    cfg : autocfg dataclass instance
+        The config to intern, modified in place.
+    table : InternTable, optional
+        The table to use, default is a module level table.
+    """
+    if table is None:
+        table = _DEFAULT_TABLE
+    return table.intern(cfg)
+
+
+def _leaf_key(value):
+    # types are part of the key as 1 == 1.0 == True
+    if isinstance(value, _SCALAR_TYPES):
+        return (type(value), value)
+    if type(value) is tuple:
+        keys = tuple(_leaf_key(v) for v in value)
+        return None if None in keys else (tuple, keys)
+    if type(value) is frozenset:
+        keys = frozenset(_leaf_key(v) for v in value)
+        return None if None in keys else (frozenset, keys)
+    return None
+
+
+def _config_key(cfg):
+    if not cfg.__dict__.get('_frozen', False):
+        return None
+    items = []
+    for f in fields(cfg):
+        value = cfg.__dict__.get(f.name, None)
+        if is_dataclass_instance(value):
+            # already interned, equal sub-configs are identical
+            if _config_key(value) is None:
+                return None
+            key = ('config', id(value))
+        else:
+            key = _leaf_key(value)
+            if key is None:
+                return None
+        items.append((f.name, key))
+    return (type(cfg), cfg.__auto_version__, tuple(items))
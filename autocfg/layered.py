@@ -0,0 +1,156 @@
+"""Single pass resolution of a config from ordered layers of defaults, files, environment and CLI."""
+import argparse
+import copy
+import os
+import yaml
+from dataclasses import is_dataclass, fields
+from .annotate import AnnotateField
+from .dataclasses import _read_dict, _parse_args_impl, flatten_fields, unflatten_dict, is_dataclass_instance, iter_items
+from .type_check import python_type
+
+__all__ = ['FileSource', 'EnvSource', 'CliSource', 'DictSource', 'resolve']
+
+
+class DictSource:
+    """Layer of values from a nested dict."""
+    def __init__(self, d, name='dict'):
+        self.d = d
+        self.name = name
+
+    def read(self, cls):
+        """Return {dotted_path: value} of the values set by this layer."""
+        return _flatten_dict(self.d, _nested_paths(cls))
+
+
+class FileSource(DictSource):
+    """Layer of values from a .yaml, .yml or .json file, read when resolving."""
+    def __init__(self, path, name=None):
+        super().__init__(None, name=name or path)
+        self.path = path
+
+    def read(self, cls):
+        return _flatten_dict(_read_dict(self.path), _nested_paths(cls))
+
+
+class EnvSource:
+    """Layer of values from environment variables.
+
+    The variable of field `xxx.yyy_zzz` is `{prefix}XXX__YYY_ZZZ`. Values of
+    `str`, `int`, `float` and `bool` fields are converted with the field type,
+    e.g. `MYAPP_OPTIMIZER__LR=1e-3`, others are parsed as YAML, e.g.
+    `MYAPP_IMAGE_SIZE='[320, 320]'`.
+    """
+    def __init__(self, prefix, environ=None):
+        self.prefix = prefix
+        self.environ = environ
+        self.name = f'env:{prefix}'
+
+    def read(self, cls):
+        environ = os.environ if self.environ is None else self.environ
+        flat = {}
+        for name, field_type, _ in flatten_fields(cls):
+            key = self.prefix + name.upper().replace('.', '__')
+            if key in environ:
+                flat[name] = _parse_env(environ[key], field_type)
+        return flat
+
+
+class CliSource:
+    """Layer of values from command line arguments, named like `parse_args` does.
+
+    Only the arguments actually given are set by this layer.
+    """
+    def __init__(self, args=None, name='cli'):
+        self.args = args
+        self.name = name
+
+    def read(self, cls):
+        parser = argparse.ArgumentParser(f"{cls.__name__}'s layered argument parser")
+        _parse_args_impl(cls, parser, None)
+        for action in parser._actions:
+            # unset arguments must not hide values of lower layers
+            action.default = argparse.SUPPRESS
+        return vars(parser.parse_args(args=self.args))
+
+
+def resolve(cls, sources):
+    """Resolve a config of `cls` from `sources`, later sources override earlier ones.
+
+    Every source only contributes the values it sets, the final value of
+    each field path is picked first and the config is constructed and
+    validated once. Fields not set by any source keep the class defaults.
+
+    Parameters
+    ----------
+    cls : autocfg dataclass
+        The config class.
+    sources : list
+        `DictSource`, `FileSource`, `EnvSource` or `CliSource` layers, a
+        `str` is taken as `FileSource` and a `dict` as `DictSource`.
+
+    Returns
+    -------
+    (cfg, provenance)
+        The config, and {dotted_path: name of the source setting it or 'default'}.
+    """
+    provenance = {name: 'default' for name, _, _ in flatten_fields(cls)}
+    flat = {}
+    for source in sources:
+        if isinstance(source, str):
+            source = FileSource(source)
+        elif isinstance(source, dict):
+            source = DictSource(source)
+        for k, v in source.read(cls).items():
+            flat[k] = v
+            provenance[k] = source.name
+    return cls(**unflatten_dict(flat)), provenance
+
+
+def _nested_paths(cls, prefix=''):
+    """Dotted paths of the nested dataclass fields of `cls`."""
+    paths = set()
+    for f in fields(cls):
+        field_type = f.type.type if isinstance(f.type, AnnotateField) else f.type
+        if is_dataclass(field_type):
+            paths.add(prefix + f.name)
+            paths.update(_nested_paths(field_type, prefix + f.name + '.'))
+    return paths
+
+
+def _flatten_dict(d, nested, prefix=''):
+    flat = {}
+    for k, v in d.items():
+        name = prefix + k
+        if name in nested and isinstance(v, dict):
+            flat.update(_flatten_dict(v, nested, name + '.'))
+        elif name in nested and is_dataclass_instance(v):
+            # per leaf, copied so that later layers never modify the given config
+            flat.update((k, copy.deepcopy(leaf)) for k, leaf in iter_items(v, prefix=name + '.'))
+        else:
+            flat[name] = v
+    return flat
+
+
+_BOOL_STRINGS = {'1': True, 'true': True, 'yes': True, 'on': True,
+                 '0': False, 'false': False, 'no': False, 'off': False}
+
+
+def _parse_env(value, field_type):
+    if field_type is str:
+        return value
+    if field_type is bool:
+        # invalid values are left for the validation to report
+        return _BOOL_STRINGS.get(value.strip().lower(), value)
+    if field_type in (int, float):
+        try:
+            return field_type(value)
+        except ValueError:
+            return value
+    parsed = yaml.safe_load(value)
+    if isinstance(parsed, list):
+        try:
+            if python_type(field_type) is tuple:
+                return tuple(parsed)
+        except (AttributeError, NotImplementedError):
+            pass
+    return parsed
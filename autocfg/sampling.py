@@ -0,0 +1,132 @@
+"""Vectorized sampling of configs from search spaces declared by AnnotateField."""
+import copy
+import numpy as np
+from dataclasses import fields, is_dataclass, _MISSING_TYPE
+from .annotate import AnnotateField
+from .columnar import ColumnStore, _DTYPES, _object_array
+from .dataclasses import _build_trusted, _removed_fields
+from .type_check import is_instance
+
+__all__ = ['sample']
+
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, tuple, frozenset)
+
+
+def sample(cls, n, seed=None, as_columns=False):
+    """Draw `n` configs of `cls` at once.
+
+    Fields annotated with `AnnotateField(..., choices=...)` are drawn uniformly
+    from the choices, fields with `low` and `high` uniformly (or log-uniformly
+    if `log` is True) from the inclusive range, all other fields take their
+    default values. The search spaces are type checked once per field, so the
+    drawn configs are constructed without per-instance validation.
+
+    Parameters
+    ----------
+    cls : type
+        The autocfg dataclass to sample.
+    n : int
+        Number of configs.
+    seed : int or numpy.random.Generator, optional
+        Seed of the random generator.
+    as_columns : bool, optional, default is False
+        Return a `ColumnStore` instead of a list of instances.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    _sample_columns(cls, n, rng, '', columns)
+    if as_columns:
+        return ColumnStore.from_columns(cls, columns)
+    return _build_rows(cls, {k: v.tolist() for k, v in columns.items()}, n, '')
+
+
+def _sample_columns(cls, n, rng, prefix, columns):
+    removed = _removed_fields(cls)
+    for f in fields(cls):
+        if f.name in removed:
+            continue
+        name = prefix + f.name
+        af = f.type if isinstance(f.type, AnnotateField) else None
+        ftype = af.type if af else f.type
+        if is_dataclass(ftype):
+            _sample_columns(ftype, n, rng, name + '.', columns)
+            continue
+        dtype = _DTYPES.get(ftype, object)
+        if af is not None and af.choices is not None:
+            if not af.choices:
+                raise ValueError(f'`{cls}.{f.name}` has empty choices')
+            for choice in af.choices:
+                if not is_instance(choice, ftype):
+                    raise TypeError(f'`{cls}.{f.name}` requires {ftype}, given choice {type(choice)}:{choice}')
+            choices = _object_array(af.choices) if dtype is object else np.asarray(af.choices, dtype=dtype)
+            column = choices[rng.integers(len(choices), size=n)]
+            if dtype is object and not all(isinstance(c, _IMMUTABLE_TYPES) for c in af.choices):
+                # every config owns its mutable choice
+                for i in range(n):
+                    column[i] = copy.deepcopy(column[i])
+            columns[name] = column
+        elif af is not None and (af.low is not None or af.high is not None):
+            columns[name] = _sample_range(cls, f.name, ftype, af, n, rng)
+        else:
+            columns[name] = _default_column(cls, f, ftype, dtype, n)
+
+
+def _sample_range(cls, name, ftype, af, n, rng):
+    if af.low is None or af.high is None or af.low > af.high:
+        raise ValueError(f'`{cls}.{name}` requires low <= high, given [{af.low}, {af.high}]')
+    if af.log and af.low <= 0:
+        raise ValueError(f'`{cls}.{name}` requires low > 0 for log scale, given {af.low}')
+    if ftype is int:
+        if af.log:
+            values = np.exp(rng.uniform(np.log(af.low), np.log(af.high + 1), size=n))
+            return np.clip(np.floor(values), af.low, af.high).astype(np.int64)
+        return rng.integers(af.low, af.high, size=n, endpoint=True)
+    if ftype is float:
+        if af.log:
+            return np.exp(rng.uniform(np.log(af.low), np.log(af.high), size=n))
+        return rng.uniform(af.low, af.high, size=n)
+    raise TypeError(f'`{cls}.{name}` range sampling requires int or float, given {ftype}')
+
+
+def _default_column(cls, f, ftype, dtype, n):
+    if not isinstance(f.default, _MISSING_TYPE):
+        default = f.default
+        make = None
+    elif not isinstance(f.default_factory, _MISSING_TYPE):
+        default = f.default_factory()
+        make = f.default_factory
+    else:
+        raise TypeError(f'`{cls}.{f.name}` has neither default value nor search space')
+    if not is_instance(default, ftype):
+        raise TypeError(f'`{cls}.{f.name}` requires {ftype}, given default {type(default)}:{default}')
+    if dtype is np.str_:
+        # width of the unicode dtype is inferred from the value
+        return np.full(n, default)
+    if dtype is not object:
+        return np.full(n, default, dtype=dtype)
+    column = np.empty(n, dtype=object)
+    if isinstance(default, _IMMUTABLE_TYPES):
+        column.fill(default)
+    else:
+        # every config owns its mutable default
+        for i in range(n):
+            column[i] = make() if make is not None else copy.deepcopy(default)
+    return column
+
+
+def _build_rows(cls, columns, n, prefix):
+    per_field = {}
+    removed = _removed_fields(cls)
+    for f in fields(cls):
+        if f.name in removed:
+            continue
+        ftype = f.type.type if isinstance(f.type, AnnotateField) else f.type
+        name = prefix + f.name
+        if is_dataclass(ftype):
+            per_field[f.name] = _build_rows(ftype, columns, n, name + '.')
+        else:
+            per_field[f.name] = columns[name]
+    names = list(per_field.keys())
+    if not names:
+        return [_build_trusted(cls, {}) for _ in range(n)]
+    return [_build_trusted(cls, dict(zip(names, row))) for row in zip(*per_field.values())]
@@ -0,0 +1,191 @@
+"""Compiled schemas of config classes, for validating raw dicts and exporting JSON Schema."""
+import json
+import typing
+import weakref
+from dataclasses import is_dataclass, field, _MISSING_TYPE, _FIELD
+from .annotate import AnnotateField
+from .dataclasses import _version_plan, is_dataclass_instance
+from .type_check import (compile_check, check_array, is_array, is_qualified_generic, get_base_generic,
+                         get_subtypes, _get_name, _get_python_type)
+
+__all__ = ['Schema', 'compile_schema']
+
+_SCHEMAS = weakref.WeakKeyDictionary()
+
+
+class FieldSchema:
+    """Compiled check of one field."""
+    def __init__(self, name, field_def, mark=None):
+        self.name = name
+        self.spec = field_def.type if isinstance(field_def.type, AnnotateField) else None
+        self.type = self.spec.type if self.spec else field_def.type
+        self.required = isinstance(field_def.default, _MISSING_TYPE) and \
+            isinstance(field_def.default_factory, _MISSING_TYPE)
+        self.default = field_def.default
+        self.nested = compile_schema(self.type) if is_dataclass(self.type) else None
+        self.check = compile_check(self.type)
+        self.mark = mark
+
+
+class Schema:
+    """Schema of an autocfg class, created by `compile_schema`.
+
+    `validate` checks a raw nested dict as `cls(**d)` would, including the
+    version rules of `AnnotateField`, without constructing any object.
+    """
+    def __init__(self, cls):
+        self.cls = cls
+        self.version = cls.__auto_version__
+        plan = _version_plan(cls)
+        self.removed = {name: v['message'] for name, v in plan.items() if v['mark'] != 'deprecated'}
+        self.fields = {}
+        for name, field_def in cls.__dataclass_fields__.items():
+            if field_def._field_type is not _FIELD or name in self.removed:
+                continue
+            self.fields[name] = FieldSchema(name, field_def, plan.get(name, {}).get('mark', None))
+        for name in getattr(cls, '__auto_fields__', ()):
+            # not annotated fields, registered as `Any` on first construction
+            if name not in self.fields:
+                field_def = field(default=getattr(cls, name, None))
+                field_def.type = typing.Any
+                self.fields[name] = FieldSchema(name, field_def)
+        self._keys = tuple(cls.__dataclass_fields__)
+
+    def validate(self, d, strict=False, prefix=''):
+        """Return the list of errors of dict `d`, empty if valid.
+
+        With `strict=True`, unexpected keys are errors, otherwise they are
+        ignored like the constructor does (with a warning).
+        """
+        if not isinstance(d, dict):
+            return [f'{prefix or self.cls.__name__} requires dict for {self.cls}, given {type(d)}']
+        errors = []
+        for k, v in d.items():
+            name = prefix + str(k)
+            fs = self.fields.get(k, None)
+            if fs is None:
+                if k in self.removed:
+                    errors.append(f'{name}: {self.removed[k]}')
+                elif strict:
+                    errors.append(f'{name}: unexpected key in {self.cls}')
+                continue
+            if fs.nested is not None:
+                if isinstance(v, dict):
+                    errors.extend(fs.nested.validate(v, strict=strict, prefix=name + '.'))
+                elif not isinstance(v, fs.nested.cls):
+                    errors.append(f'{name}: requires {fs.type}, given {type(v)}')
+                continue
+            if not fs.check(v):
+                errors.append(f'{name}: requires {fs.type}, given {type(v)}:{v}')
+            elif fs.spec is not None and (fs.spec.dtype is not None or fs.spec.shape is not None) and \
+                    not check_array(v, fs.spec.dtype, fs.spec.shape):
+                errors.append(f'{name}: requires array of dtype {fs.spec.dtype} and shape {fs.spec.shape}')
+        for k, fs in self.fields.items():
+            if fs.required and k not in d:
+                errors.append(f'{prefix}{k}: missing required field')
+        return errors
+
+    def to_json_schema(self, root=True):
+        """Export as JSON Schema (draft 2020-12) of the dict accepted by `validate`.
+
+        Search spaces of `AnnotateField` (`choices`, `low` and `high`) are not
+        enforced on construction, so they are not exported either.
+        """
+        properties = {}
+        required = []
+        for name, fs in self.fields.items():
+            prop = fs.nested.to_json_schema(root=False) if fs.nested is not None else _json_type(fs.type)
+            if fs.mark == 'deprecated':
+                prop['deprecated'] = True
+            if not isinstance(fs.default, _MISSING_TYPE) and _is_json(fs.default):
+                prop['default'] = _to_json(fs.default)
+            properties[name] = prop
+            if fs.required:
+                required.append(name)
+        for name in self.removed:
+            # not available in this version, any value is invalid
+            properties[name] = False
+        schema = {'title': self.cls.__name__, 'type': 'object', 'properties': properties}
+        if required:
+            schema['required'] = required
+        if root:
+            schema = {'$schema': 'https://json-schema.org/draft/2020-12/schema', **schema}
+        return schema
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.cls.__name__}, version={self.version}, fields={list(self.fields)})'
+
+
+def compile_schema(cls):
+    """Return the compiled `Schema` of autocfg class `cls`, cached per class."""
+    schema = _SCHEMAS.get(cls, None)
+    # classes gain auto annotated fields on first construction and lose removed ones
+    if schema is None or schema._keys != tuple(cls.__dataclass_fields__):
+        schema = Schema(cls)
+        _SCHEMAS[cls] = schema
+    return schema
+
+
+_JSON_TYPES = {bool: 'boolean', int: 'integer', float: 'number', str: 'string', type(None): 'null',
+               list: 'array', tuple: 'array', set: 'array', frozenset: 'array', dict: 'object'}
+
+
+def _json_type(tp):
+    if tp is typing.Any:
+        return {}
+    if tp is None:
+        return {'type': 'null'}
+    if is_dataclass(tp):
+        return compile_schema(tp).to_json_schema(root=False)
+    if getattr(tp, '__module__', None) == 'typing':
+        base = get_base_generic(tp) if is_qualified_generic(tp) else tp
+        name = _get_name(base)
+        if name in ('Union', 'Optional'):
+            return {'anyOf': [_json_type(t) for t in get_subtypes(tp)]}
+        try:
+            python_type = _get_python_type(tp)
+        except (AttributeError, NotImplementedError):
+            return {}
+        if not isinstance(python_type, type):
+            return {}
+        args = get_subtypes(tp) if is_qualified_generic(tp) else ()
+        schema = _json_type(python_type)
+        if args and schema.get('type') == 'array':
+            if python_type is tuple:
+                if len(args) == 2 and args[1] is Ellipsis:
+                    schema['items'] = _json_type(args[0])
+                else:
+                    schema.update({'prefixItems': [_json_type(t) for t in args],
+                                   'minItems': len(args), 'maxItems': len(args)})
+            else:
+                schema['items'] = _json_type(args[0])
+        elif len(args) == 2 and schema.get('type') == 'object':
+            schema['additionalProperties'] = _json_type(args[1])
+        return schema
+    if isinstance(tp, type):
+        for python_type, json_type in _JSON_TYPES.items():
+            if issubclass(tp, python_type) and not (python_type is int and issubclass(tp, bool)):
+                schema = {'type': json_type}
+                if python_type in (set, frozenset):
+                    schema['uniqueItems'] = True
+                return schema
+        if tp.__module__.startswith('numpy') or tp.__name__ in ('array', 'memoryview'):
+            # saved as reference to a sidecar file
+            return {'type': 'object', 'properties': {'__array__': {'type': 'string'}}, 'required': ['__array__']}
+    return {}
+
+
+def _to_json(value):
+    if isinstance(value, (tuple, list)):
+        return [_to_json(v) for v in value]
+    return value
+
+
+def _is_json(value):
+    if is_array(value) or is_dataclass_instance(value):
+        return False
+    try:
+        json.dumps(_to_json(value))
+    except (TypeError, ValueError):
+        return False
+    return True
@@ -1,8 +1,12 @@
 """Type validation for complex types, e.g. typing.xx"""
+import array
 import inspect
+import sys
 import typing
+import weakref
 
-__all__ = ['is_instance', 'is_subtype', 'python_type', 'is_generic', 'is_base_generic', 'is_qualified_generic']
+__all__ = ['is_instance', 'compile_check', 'is_array', 'check_array', 'is_subtype', 'python_type', 'is_generic', 'is_base_generic', 'is_qualified_generic',
+           'cache_info', 'clear_caches']
 
 
 if hasattr(typing, '_GenericAlias'):
@@ -198,7 +202,7 @@ def _instancecheck_iterable(iterable, type_args):
         raise TypeError("Generic iterables must have exactly 1 type argument; found {}".format(type_args))
 
     type_ = type_args[0]
-    return all(is_instance(val, type_) for val in iterable)
+    return all(_is_instance(val, type_) for val in iterable)
 
 
 def _instancecheck_mapping(mapping, type_args):
@@ -210,14 +214,18 @@ def _instancecheck_itemsview(itemsview, type_args):
         raise TypeError("Generic mappings must have exactly 2 type arguments; found {}".format(type_args))
 
     key_type, value_type = type_args
-    return all(is_instance(key, key_type) and is_instance(val, value_type) for key, val in itemsview)
+    return all(_is_instance(key, key_type) and _is_instance(val, value_type) for key, val in itemsview)
 
 
 def _instancecheck_tuple(tup, type_args):
+    if len(type_args) == 2 and type_args[1] is Ellipsis:
+        # variadic, e.g. Tuple[int, ...]
+        return all(_is_instance(val, type_args[0]) for val in tup)
+
     if len(tup) != len(type_args):
         return False
 
-    return all(is_instance(val, type_) for val, type_ in zip(tup, type_args))
+    return all(_is_instance(val, type_) for val, type_ in zip(tup, type_args))
 
 
 _ORIGIN_TYPE_CHECKERS = {}
@@ -259,6 +267,174 @@ for class_path, check_func in {
     _ORIGIN_TYPE_CHECKERS[cls] = check_func
 
 
+_MISSING = object()
+
+
+class _WeakCache:
+    """
+    Bounded cache of results weakly keyed on a class or callable, then on an annotation.
+    Entries are dropped when the class or callable is garbage collected, or first-in first-out
+    when more than `maxsize` keys are cached.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+
+    def get(self, key, sub_key):
+        try:
+            value = self._data[weakref.ref(key)][sub_key]
+        except (KeyError, TypeError):
+            self.misses += 1
+            return _MISSING
+        self.hits += 1
+        return value
+
+    def set(self, key, sub_key, value):
+        try:
+            self._data.setdefault(weakref.ref(key, self._discard), {})[sub_key] = value
+        except TypeError:
+            # not weak referenceable or not hashable
+            return
+        while len(self._data) > self.maxsize:
+            try:
+                del self._data[next(iter(self._data))]
+            except (KeyError, RuntimeError, StopIteration):
+                # concurrently modified
+                break
+
+    def _discard(self, ref):
+        self._data.pop(ref, None)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return _info(self)
+
+
+_IMMUTABLE_SCALARS = frozenset((str, bytes, int, float, complex, bool, type(None)))
+
+
+def _is_immutable(value):
+    cls = type(value)
+    if cls in _IMMUTABLE_SCALARS:
+        return True
+    if cls is tuple or cls is frozenset:
+        return all(_is_immutable(v) for v in value)
+    return False
+
+
+class _InstanceCache:
+    """
+    Bounded cache of `is_instance` results of recursively immutable values against a type.
+    Scalars are keyed on their type and value, tuples and frozensets on their identity, which
+    the cached entry keeps alive and verifies. Anything else, including tuples holding mutable
+    values, is never cached. Entries are dropped first-in first-out when more than `maxsize`
+    are cached.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+
+    @staticmethod
+    def _key(value, type_):
+        cls = type(value)
+        if cls in _IMMUTABLE_SCALARS:
+            return (id(type_), cls, value)
+        if cls is tuple or cls is frozenset:
+            return (id(type_), id(value))
+        return None
+
+    def get(self, value, type_):
+        key = self._key(value, type_)
+        if key is None:
+            return _MISSING
+        entry = self._data.get(key, None)
+        # ids may be reused after the referenced objects are evicted
+        if entry is None or entry[0] is not type_ or (len(key) == 2 and entry[1] is not value):
+            self.misses += 1
+            return _MISSING
+        self.hits += 1
+        return entry[2]
+
+    def set(self, value, type_, result):
+        key = self._key(value, type_)
+        if key is None or (len(key) == 2 and not _is_immutable(value)):
+            return
+        self._data[key] = (type_, value, result)
+        while len(self._data) > self.maxsize:
+            try:
+                del self._data[next(iter(self._data))]
+            except (KeyError, RuntimeError, StopIteration):
+                # concurrently modified
+                break
+
+    def held(self):
+        """Returns {id(value): number of entries keeping it alive} of the cached tuples and frozensets."""
+        counts = {}
+        for key in list(self._data):
+            if len(key) == 2:
+                counts[key[1]] = counts.get(key[1], 0) + 1
+        return counts
+
+    def discard(self, ids):
+        """Drops the entries of the tuples and frozensets with id in `ids`."""
+        for key in [k for k in list(self._data) if len(k) == 2 and k[1] in ids]:
+            self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return _info(self)
+
+
+def _info(cache):
+    lookups = cache.hits + cache.misses
+    return {'hits': cache.hits, 'misses': cache.misses, 'hit_rate': cache.hits / lookups if lookups else 0.0,
+            'size': len(cache._data), 'maxsize': cache.maxsize}
+
+
+_SIGNATURE_CACHE = _WeakCache(maxsize=4096)
+_CALLABLE_CACHE = _WeakCache(maxsize=4096)
+_SUBTYPE_CACHE = _WeakCache(maxsize=4096)
+_INSTANCE_CACHE = _InstanceCache(maxsize=4096)
+
+
+def cache_info():
+    """
+    Returns hits, misses, hit rate and size of the caches of callable signatures, `Callable[...]`
+    checks, `is_subtype` relations and checks of immutable values against generic types.
+    """
+    return {
+        'signature': _SIGNATURE_CACHE.info(),
+        'callable': _CALLABLE_CACHE.info(),
+        'subtype': _SUBTYPE_CACHE.info(),
+        'instance': _INSTANCE_CACHE.info(),
+    }
+
+
+def clear_caches():
+    for cache in (_SIGNATURE_CACHE, _CALLABLE_CACHE, _SUBTYPE_CACHE, _INSTANCE_CACHE):
+        cache.clear()
+
+
+def _signature(value):
+    sig = _SIGNATURE_CACHE.get(value, None)
+    if sig is _MISSING:
+        sig = inspect.signature(value)
+        _SIGNATURE_CACHE.set(value, None, sig)
+    return sig
+
+
 def _instancecheck_callable(value, type_):
     if not callable(value):
         return False
@@ -266,8 +442,17 @@ def _instancecheck_callable(value, type_):
     if is_base_generic(type_):
         return True
 
+    result = _CALLABLE_CACHE.get(value, type_)
+    if result is _MISSING:
+        # raises for missing annotations, which is not cached
+        result = _instancecheck_signature(value, type_)
+        _CALLABLE_CACHE.set(value, type_, result)
+    return result
+
+
+def _instancecheck_signature(value, type_):
     param_types, ret_type = get_subtypes(type_)
-    sig = inspect.signature(value)
+    sig = _signature(value)
 
     missing_annotations = []
 
@@ -302,7 +487,7 @@ def _instancecheck_callable(value, type_):
 
 def _instancecheck_union(value, type_):
     types = get_subtypes(type_)
-    return any(is_instance(value, typ) for typ in types)
+    return any(_is_instance(value, typ) for typ in types)
 
 
 def _instancecheck_type(value, type_):
@@ -329,6 +514,17 @@ _SPECIAL_INSTANCE_CHECKERS = {
 
 
 def is_instance(obj, type_):
+    if type_.__module__ == 'typing' and is_qualified_generic(type_):
+        result = _INSTANCE_CACHE.get(obj, type_)
+        if result is _MISSING:
+            # raises for unsupported types, which is not cached
+            result = _is_instance(obj, type_)
+            _INSTANCE_CACHE.set(obj, type_, result)
+        return result
+    return _is_instance(obj, type_)
+
+
+def _is_instance(obj, type_):
     if type_.__module__ == 'typing':
         if is_qualified_generic(type_):
             base_generic = get_base_generic(type_)
@@ -364,7 +560,170 @@ def is_instance(obj, type_):
     return isinstance(obj, type_)
 
 
+_COMPILED_CHECKS = {}
+_MEMOIZED_CHECKS = {}
+
+
+def compile_check(type_):
+    """
+    Returns a function `check(obj)` equivalent to `is_instance(obj, type_)` with the dispatch on
+    `type_` resolved once, for validating many values against the same type.
+    """
+    try:
+        return _MEMOIZED_CHECKS[type_]
+    except (KeyError, TypeError):
+        pass
+
+    check = _element_check(type_)
+    if type_.__module__ == 'typing' and is_qualified_generic(type_):
+        check = _memoize_check(check, type_)
+
+    try:
+        _MEMOIZED_CHECKS[type_] = check
+    except TypeError:
+        pass
+    return check
+
+
+def _element_check(type_):
+    """Compiled check without memoization, used for the elements of containers."""
+    try:
+        return _COMPILED_CHECKS[type_]
+    except (KeyError, TypeError):
+        pass
+
+    try:
+        check = _compile_check(type_)
+    except Exception:
+        # let _is_instance report unsupported types at check time
+        check = lambda obj: _is_instance(obj, type_)
+
+    try:
+        _COMPILED_CHECKS[type_] = check
+    except TypeError:
+        pass
+    return check
+
+
+def _memoize_check(check, type_):
+    def memoized(obj):
+        result = _INSTANCE_CACHE.get(obj, type_)
+        if result is _MISSING:
+            result = check(obj)
+            _INSTANCE_CACHE.set(obj, type_, result)
+        return result
+    return memoized
+
+
+def _compile_check(type_):
+    if type_ is typing.Any:
+        return lambda obj: True
+
+    if type_.__module__ == 'typing':
+        if is_qualified_generic(type_):
+            base_generic = get_base_generic(type_)
+        else:
+            base_generic = type_
+        name = _get_name(base_generic)
+
+        if name == 'Union':
+            checks = [_element_check(typ) for typ in get_subtypes(type_)]
+            return lambda obj: any(check(obj) for check in checks)
+
+        if name in _SPECIAL_INSTANCE_CHECKERS:
+            validator = _SPECIAL_INSTANCE_CHECKERS[name]
+            return lambda obj: validator(obj, type_)
+
+    if is_base_generic(type_):
+        python_type = _get_python_type(type_)
+        return lambda obj: isinstance(obj, python_type)
+
+    if is_qualified_generic(type_):
+        python_type = _get_python_type(type_)
+        validator = _ORIGIN_TYPE_CHECKERS.get(get_base_generic(type_), None)
+        type_args = get_subtypes(type_)
+
+        if validator is _instancecheck_iterable and len(type_args) == 1:
+            item_check = _element_check(type_args[0])
+            return lambda obj: isinstance(obj, python_type) and all(map(item_check, obj))
+
+        if validator is _instancecheck_mapping and len(type_args) == 2:
+            key_check, value_check = _element_check(type_args[0]), _element_check(type_args[1])
+            return lambda obj: isinstance(obj, python_type) and \
+                all(key_check(key) and value_check(val) for key, val in obj.items())
+
+        if validator is _instancecheck_tuple and len(type_args) == 2 and type_args[1] is Ellipsis:
+            item_check = _element_check(type_args[0])
+            return lambda obj: isinstance(obj, python_type) and all(map(item_check, obj))
+
+        if validator is _instancecheck_tuple:
+            checks = [_element_check(typ) for typ in type_args]
+            return lambda obj: isinstance(obj, python_type) and len(obj) == len(checks) and \
+                all(check(val) for check, val in zip(checks, obj))
+
+        return lambda obj: _is_instance(obj, type_)
+
+    return lambda obj: isinstance(obj, type_)
+
+
+def is_array(obj):
+    """
+    Detects array values stored as raw binary: `numpy.ndarray`, `array.array` and `memoryview`.
+    NumPy scalars such as `numpy.float64` are plain values.
+    """
+    if isinstance(obj, (array.array, memoryview)):
+        return True
+    # numpy arrays only exist if numpy is imported already
+    np = sys.modules.get('numpy', None)
+    return np is not None and isinstance(obj, np.ndarray)
+
+
+def check_array(obj, dtype=None, shape=None):
+    """
+    Checks dtype and shape of an array value, `None` in `shape` matches any size of that dimension.
+    """
+    if isinstance(obj, array.array):
+        actual_dtype, actual_shape = obj.typecode, (len(obj),)
+    elif isinstance(obj, memoryview):
+        actual_dtype, actual_shape = obj.format, obj.shape
+    elif is_array(obj):
+        actual_dtype, actual_shape = obj.dtype, obj.shape
+    else:
+        return False
+
+    if dtype is not None and not _dtype_equal(actual_dtype, dtype):
+        return False
+
+    if shape is not None:
+        if len(shape) != len(actual_shape):
+            return False
+        if any(dim is not None and dim != actual for dim, actual in zip(shape, actual_shape)):
+            return False
+
+    return True
+
+
+def _dtype_equal(actual, expected):
+    try:
+        import numpy as np
+    except ImportError:
+        return str(actual) == str(expected)
+
+    try:
+        return np.dtype(actual) == np.dtype(expected)
+    except TypeError:
+        return False
+
+
 def is_subtype(sub_type, super_type):
+    result = _SUBTYPE_CACHE.get(sub_type, super_type)
+    if result is _MISSING:
+        result = _is_subtype(sub_type, super_type)
+        _SUBTYPE_CACHE.set(sub_type, super_type, result)
+    return result
+
+
+def _is_subtype(sub_type, super_type):
     if not is_generic(sub_type):
         python_super = python_type(super_type)
         return issubclass(sub_type, python_super)
@@ -406,15 +765,11 @@ def python_type(annotation):
         >>> python_type(int)
         <class 'int'>
     """
-    try:
-        mro = annotation.mro()
-    except AttributeError:
+    if not hasattr(annotation, 'mro'):
         # if it doesn't have an mro method, it must be a weird typing object
         return _get_python_type(annotation)
 
-    if Type in mro:
-        return annotation.python_type
-    elif annotation.__module__ == 'typing':
+    if annotation.__module__ == 'typing':
         return _get_python_type(annotation)
     else:
         return annotation
@@ -0,0 +1,130 @@
+"""Hot reload of changed keys from a config file."""
+import os
+import threading
+import warnings
+from .dataclasses import _read_dict, is_dataclass_instance, unflatten_dict, values_equal
+from .handle import ConfigHandle
+
+__all__ = ['ConfigWatcher']
+
+_MISSING = object()
+
+
+class ConfigWatcher:
+    """Watch a config file and apply only the changed keys to a config.
+
+    The file is polled with `os.stat`, which works on every platform and
+    file system. On change, the file is parsed into a dict and compared
+    key by key against the current config. Only the changed keys are passed
+    to the validated `update` path, then the callbacks of the changed
+    dotted paths are called with `(path, old_value, new_value)`.
+
+    Keys missing from the file are left unchanged. If an update fails
+    validation, a warning is issued and the file is checked again on its
+    next change. With a `ConfigHandle` as target, a failed update leaves
+    the published snapshot untouched, a plain config may keep the keys
+    applied before the failing one.
+
+    Parameters
+    ----------
+    target : autocfg dataclass instance or ConfigHandle
+        The config to update.
+    path : str
+        The .yaml, .yml or .json file to watch.
+    interval : float, optional, default is 1.0
+        Seconds between two polls of the background thread.
+    """
+    def __init__(self, target, path, interval=1.0):
+        self.target = target
+        self.path = path
+        self.interval = interval
+        self._callbacks = []
+        self._stat = _stat(path)
+        self._thread = None
+        self._stop = threading.Event()
+
+    def on_change(self, fn, path=None):
+        """Call `fn(path, old, new)` for each changed dotted path, or only for `path` and below it."""
+        self._callbacks.append((path, fn))
+        return fn
+
+    def _config(self):
+        if isinstance(self.target, ConfigHandle):
+            return self.target.snapshot()
+        return self.target
+
+    def check(self, force=False):
+        """Apply changes if the file changed since the last check, return {path: (old, new)}."""
+        stat = _stat(self.path)
+        if stat is None or (stat == self._stat and not force):
+            return {}
+        self._stat = stat
+        d = _read_dict(self.path)
+        changes = {}
+        _diff_config(self._config(), d, '', changes)
+        if not changes:
+            return changes
+        self.target.update(unflatten_dict({k: new for k, (old, new) in changes.items()}))
+        for name, (old, new) in changes.items():
+            for prefix, fn in self._callbacks:
+                if prefix is None or name == prefix or name.startswith(prefix + '.'):
+                    fn(name, old, new)
+        return changes
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                warnings.warn(f'Unable to reload {self.path}: {e}')
+
+    def start(self):
+        """Start polling in a daemon thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f'{self.__class__.__name__}({self.path})',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _diff_config(cfg, d, prefix, changes):
+    """Collect {dotted_path: (old, new)} of values in dict `d` differing from `cfg`."""
+    for k, v in d.items():
+        old = getattr(cfg, k, _MISSING)
+        name = prefix + k
+        if is_dataclass_instance(old) and isinstance(v, dict):
+            _diff_config(old, v, name + '.', changes)
+        elif old is _MISSING or not _equal(old, v):
+            changes[name] = (None if old is _MISSING else old, v)
+
+
+def _equal(a, b):
+    return values_equal(_normalize(a), _normalize(b))
+
+
+def _normalize(value):
+    # tuple <-> list is interchangable, e.g. in .json files
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
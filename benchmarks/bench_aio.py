@@ -0,0 +1,70 @@
+"""Event loop latency while loading many configs with blocking `load` versus `aload`."""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg.aio import load_many, set_max_workers
+
+
+@dataclass
+class TrialConfig:
+    name : str = 'trial'
+    lr : float = 0.1
+    milestones : List[int] = field(default_factory=lambda: list(range(0, 300, 3)))
+    layers : List[str] = field(default_factory=lambda: [f'layer{i}' for i in range(100)])
+
+
+async def ticker(lags, stop, period=0.001):
+    while not stop.is_set():
+        tic = time.perf_counter()
+        await asyncio.sleep(period)
+        lags.append(time.perf_counter() - tic - period)
+
+
+async def measure(load, files):
+    lags = []
+    stop = asyncio.Event()
+    task = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(0.01)
+    tic = time.perf_counter()
+    await load(files)
+    elapsed = time.perf_counter() - tic
+    stop.set()
+    await task
+    return elapsed, lags
+
+
+async def blocking(files):
+    return [TrialConfig.load(f) for f in files]
+
+
+async def concurrent(files):
+    return await load_many(TrialConfig, files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=500, help='number of config files')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    set_max_workers(args.workers)
+    with tempfile.TemporaryDirectory() as root:
+        files = [os.path.join(root, f'trial{i}.yaml') for i in range(args.n)]
+        for i, f in enumerate(files):
+            TrialConfig(name=f'trial{i}').save(f)
+        for name, load in (('load', blocking), ('aload', concurrent)):
+            elapsed, lags = asyncio.run(measure(load, files))
+            lags_ms = sorted(lag * 1e3 for lag in lags) or [0.]
+            p99 = lags_ms[round(0.99 * (len(lags_ms) - 1))]
+            print(f'{name:<6} total {elapsed:6.2f} s  ticks {len(lags):6d}  loop lag mean '
+                  f'{statistics.mean(lags_ms):8.2f} ms  p99 {p99:8.2f} ms  max {lags_ms[-1]:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
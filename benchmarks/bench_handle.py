@@ -0,0 +1,87 @@
+"""Multi-threaded read throughput of `ConfigHandle` snapshots versus a lock around every read."""
+import argparse
+import threading
+import time
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg.handle import ConfigHandle
+
+
+@dataclass
+class ModelConfig:
+    depth : int = 50
+    width : int = 50
+
+
+@dataclass
+class ServeConfig:
+    model : ModelConfig = field(default_factory=ModelConfig)
+    threshold : float = 0.5
+    max_batch : int = 32
+
+
+def run(read, write, threads, duration):
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def reader(i):
+        n = 0
+        while not stop.is_set():
+            for _ in range(100):
+                read()
+            n += 100
+        counts[i] = n
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            write(i)
+            i += 1
+            time.sleep(0.001)
+
+    workers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=writer))
+    for t in workers:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in workers:
+        t.join()
+    return sum(counts) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--duration', type=float, default=2.)
+    args = parser.parse_args()
+
+    for threads in args.threads:
+        cfg = ServeConfig()
+        lock = threading.Lock()
+
+        def locked_read():
+            with lock:
+                return cfg.model.depth + cfg.model.width + cfg.threshold
+
+        def locked_write(i):
+            with lock:
+                cfg.update({'model': {'depth': i, 'width': i}})
+
+        handle = ConfigHandle(ServeConfig())
+
+        def snapshot_read():
+            snap = handle.snapshot()
+            return snap.model.depth + snap.model.width + snap.threshold
+
+        def snapshot_write(i):
+            handle.update({'model': {'depth': i, 'width': i}})
+
+        locked = run(locked_read, locked_write, threads, args.duration)
+        snapshot = run(snapshot_read, snapshot_write, threads, args.duration)
+        print(f'{threads} reader threads: locked {locked:12.0f} reads/s  snapshot {snapshot:12.0f} reads/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Report memory of a sweep of trial configs with and without `autocfg.intern`."""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Tuple
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg.intern import InternTable, intern_config
+
+
+@dataclass
+class DataConfig:
+    root : str = '~/.datasets/imagenet'
+    mean : Tuple[float, float, float] = (0.485, 0.456, 0.406)
+    std : Tuple[float, float, float] = (0.229, 0.224, 0.225)
+    num_workers : int = 8
+
+
+@dataclass
+class BackboneConfig:
+    name : str = 'resnet50'
+    stages : Tuple[int, int, int, int] = (3, 4, 6, 3)
+    pretrained : bool = True
+
+
+@dataclass
+class ModelConfig:
+    backbone : BackboneConfig = field(default_factory=BackboneConfig)
+    num_classes : int = 1000
+
+
+@dataclass
+class EvalConfig:
+    batch_size : int = 256
+    crop_ratio : float = 0.875
+    metrics : Tuple[str, str] = ('top1', 'top5')
+
+
+@dataclass
+class TrialConfig:
+    data : DataConfig = field(default_factory=DataConfig)
+    model : ModelConfig = field(default_factory=ModelConfig)
+    eval : EvalConfig = field(default_factory=EvalConfig)
+    lr : float = 0.1
+    seed : int = 0
+
+
+def make_trials(n):
+    # records as they come out of a parser, every trial owns distinct but equal objects
+    records = [{'data': {'root': ''.join(['~/.datasets/', 'imagenet']), 'mean': tuple([0.485, 0.456, 0.406])},
+                'model': {'backbone': {'name': ''.join(['resnet', str(50 if i % 2 else 101)])}},
+                'lr': 0.1 / (1 + i % 7), 'seed': i} for i in range(n)]
+    trials = TrialConfig.from_records(records)
+    for trial in trials:
+        trial.data.freeze()
+        trial.model.freeze(recursive=True)
+        trial.eval.freeze()
+    return trials
+
+
+def measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=100000, help='number of trials')
+    args = parser.parse_args()
+
+    _, plain = measure(lambda: make_trials(args.n))
+    table = InternTable()
+
+    def interned():
+        return [intern_config(trial, table) for trial in make_trials(args.n)]
+
+    tic = time.time()
+    trials, shared = measure(interned)
+    elapsed = time.time() - tic
+    assert trials[1].data is trials[2].data
+    print(f'{args.n} trials')
+    print(f'plain     {plain / 2 ** 20:8.1f} MiB')
+    print(f'interned  {shared / 2 ** 20:8.1f} MiB  ({1 - shared / plain:.0%} saved, {elapsed:.1f} s incl. build)')
+    print(f'table     {table.info()}')
+
+
+if __name__ == '__main__':
+    main()
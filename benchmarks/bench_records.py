@@ -0,0 +1,57 @@
+"""Compare `Cfg.from_records`/`Cfg.update_many` with constructing/updating in a loop."""
+import argparse
+import timeit
+from typing import Tuple, List
+from dataclasses import field
+
+from autocfg import dataclass
+
+
+@dataclass
+class OptimizerConfig:
+    name : str = 'sgd'
+    lr : float = 0.1
+    momentum : float = 0.9
+    milestones : List[int] = field(default_factory=lambda: [30, 60, 90])
+
+
+@dataclass
+class TrialConfig:
+    optimizer : OptimizerConfig = field(default_factory=OptimizerConfig)
+    batch_size : int = 32
+    epochs : int = 100
+    image_size : Tuple[int, int] = (224, 224)
+    dataset : str = 'imagenet'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=50000, help='number of records')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    records = [{'optimizer': {'lr': 1e-3 * (i % 100), 'name': 'adam'}, 'batch_size': i % 256,
+                'image_size': (i % 512, i % 512)} for i in range(args.n)]
+    updates = [{'optimizer': {'lr': 0.5}, 'epochs': i % 10} for i in range(args.n)]
+    assert [TrialConfig(**r) for r in records[:100]] == TrialConfig.from_records(records[:100])
+
+    def loop_update():
+        for cfg, r in zip(cfgs, updates):
+            cfg.update(r)
+
+    def batch_update():
+        TrialConfig.update_many(cfgs, updates)
+
+    cfgs = TrialConfig.from_records(records)
+    timings = {
+        'Cfg(**d) loop': lambda: [TrialConfig(**r) for r in records],
+        'Cfg.from_records': lambda: TrialConfig.from_records(records),
+        'cfg.update(d) loop': loop_update,
+        'Cfg.update_many': batch_update,
+    }
+    for name, fn in timings.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f'{name:<20} {best:8.3f} s  {args.n / best:10.0f} records/s')
+
+
+if __name__ == '__main__':
+    main()
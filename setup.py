@@ -23,6 +23,9 @@ setuptools.setup(
         'pyyaml',
         'dataclasses;python_version<"3.7"',
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     tests_require=[
         'pytest'
     ]
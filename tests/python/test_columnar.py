@@ -0,0 +1,91 @@
+import pytest
+from typing import Tuple
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg import AnnotateField as AF
+
+np = pytest.importorskip('numpy')
+from autocfg.columnar import ColumnStore
+
+@dataclass
+class OptimizerConfig:
+    name : str = 'sgd'
+    lr : float = 0.1
+    nesterov : bool = False
+
+@dataclass
+class TrialConfig:
+    optimizer : OptimizerConfig = field(default_factory=OptimizerConfig)
+    epochs : int = 10
+    image_size : Tuple[int, int] = (224, 224)
+
+def _make_store(n=10):
+    store = ColumnStore(TrialConfig, capacity=2)
+    for i in range(n):
+        store.append(TrialConfig(optimizer=OptimizerConfig(lr=10. ** -i), epochs=i, image_size=(i, i)))
+    return store
+
+def test_append_and_columns():
+    store = _make_store()
+    assert len(store) == 10
+    assert store['optimizer.lr'].dtype == np.float64
+    assert store['epochs'].dtype == np.int64
+    assert store['optimizer.nesterov'].dtype == np.bool_
+    assert store['image_size'][3] == (3, 3)
+
+def test_filter_sort_row():
+    store = _make_store()
+    small = store.filter(store['optimizer.lr'] < 1e-3)
+    assert len(small) == 6
+    assert list(small['epochs']) == [4, 5, 6, 7, 8, 9]
+    ordered = store.sort('epochs', reverse=True)
+    cfg = ordered[0]
+    assert isinstance(cfg, TrialConfig)
+    assert cfg.epochs == 9 and isinstance(cfg.epochs, int)
+    assert cfg.image_size == (9, 9)
+    assert cfg.optimizer.lr == 1e-9
+
+def test_save_load(tmp_path):
+    store = _make_store()
+    f = str(tmp_path / 'trials.npz')
+    store.save(f)
+    # image_size is an object column
+    with pytest.raises(ValueError):
+        ColumnStore.load(TrialConfig, f)
+    loaded = ColumnStore.load(TrialConfig, f, allow_pickle=True)
+    assert len(loaded) == len(store)
+    assert list(loaded) == list(store)
+
+def test_str_columns_without_pickle(tmp_path):
+    store = ColumnStore(OptimizerConfig, capacity=1)
+    for name in ('sgd', 'adam', 'rmsprop_centered'):
+        store.append(OptimizerConfig(name=name))
+    assert store['name'].dtype.kind == 'U'
+    assert list(store.filter(store['name'] == 'adam')) == [OptimizerConfig(name='adam')]
+    f = str(tmp_path / 'optimizers.npz')
+    store.save(f)
+    loaded = ColumnStore.load(OptimizerConfig, f)
+    assert [c.name for c in loaded] == ['sgd', 'adam', 'rmsprop_centered']
+    assert type(loaded[0].name) is str
+
+def test_append_not_annotated_fields():
+    @dataclass
+    class AutoConfig:
+        lr : float = 0.1
+        tag = 'base'
+
+    store = ColumnStore(AutoConfig)
+    store.append(AutoConfig(lr=0.01))
+    assert list(store['lr']) == [0.01]
+
+def test_removed_fields_no_column():
+    @dataclass(version='1.0')
+    class VersionedConfig:
+        epochs : int = 10
+        gone : AF(int, deleted='0.5') = 1
+
+    store = ColumnStore(VersionedConfig)
+    assert store.names == ['epochs']
+    store.append(VersionedConfig(epochs=3))
+    assert store[0].epochs == 3
@@ -0,0 +1,68 @@
+import io
+import pytest
+from typing import Tuple
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg import AnnotateField as AF
+from autocfg.database import ConfigDB
+
+@dataclass
+class OptimizerConfig:
+    name : str = 'sgd'
+    lr : float = 0.1
+
+@dataclass
+class TrialConfig:
+    optimizer : OptimizerConfig = field(default_factory=OptimizerConfig)
+    epochs : int = 10
+    image_size : Tuple[int, int] = (224, 224)
+
+def test_append_get_query(tmp_path):
+    path = str(tmp_path / 'trials.db')
+    with ConfigDB(path, TrialConfig, index=('optimizer.name', 'image_size'), mode='a') as db:
+        for i in range(6):
+            name = 'sgd' if i % 2 else 'adam'
+            db.append(TrialConfig(optimizer=OptimizerConfig(name=name, lr=0.1 * i), epochs=i))
+        db.append(TrialConfig(image_size=(32, 32)))
+        assert len(db) == 7
+        assert db.get(3).optimizer.lr == pytest.approx(0.3)
+        assert db.find('optimizer.name', 'adam') == [0, 2, 4]
+        assert db.query({'optimizer.name': 'sgd', 'image_size': (32, 32)}) == [6]
+        with pytest.raises(KeyError):
+            db.find('epochs', 1)
+
+def test_reader_refresh(tmp_path):
+    path = str(tmp_path / 'trials.db')
+    writer = ConfigDB(path, TrialConfig, index=('epochs',), mode='a')
+    writer.append(TrialConfig(epochs=1))
+    reader = ConfigDB(path, TrialConfig)
+    assert len(reader) == 1
+    writer.append(TrialConfig(epochs=2))
+    assert len(reader) == 1
+    reader.refresh()
+    assert reader.find('epochs', 2) == [1]
+    assert reader[1] == TrialConfig(epochs=2)
+    with pytest.raises(io.UnsupportedOperation):
+        reader.append(TrialConfig())
+    reader.close()
+    writer.close()
+
+def test_reject_array_fields(tmp_path):
+    np = pytest.importorskip('numpy')
+
+    @dataclass
+    class AnchorConfig:
+        anchors : np.ndarray = field(default_factory=lambda: np.zeros((2, 4)))
+
+    with pytest.raises(TypeError):
+        ConfigDB(str(tmp_path / 'anchors.db'), AnchorConfig, index=(), mode='a')
+
+def test_index_removed_fields(tmp_path):
+    @dataclass(version='1.0')
+    class VersionedConfig:
+        epochs : int = 10
+        gone : AF(int, deleted='0.5') = 1
+
+    with pytest.raises(KeyError):
+        ConfigDB(str(tmp_path / 'versioned.db'), VersionedConfig, index=('gone',), mode='a')
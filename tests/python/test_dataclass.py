@@ -1,7 +1,10 @@
+import os
+import json
+import yaml
 import warnings
 import pytest
-from typing import Union, Tuple
-from dataclasses import fields
+from typing import Union, Tuple, List
+from dataclasses import fields, field
 
 from autocfg import dataclass, FrozenInstanceError  # advanced decorator out of dataclasses
 from autocfg import AnnotateField as AF  # version(and more) annotations
@@ -190,3 +193,268 @@ except TypeError:
 cfg.unfreeze()
 assert cfg.is_frozen() == False
 """
+
+@dataclass
+class OptimizerConfig:
+    name : str = 'sgd'
+    lr : float = 0.1
+    milestones : List[int] = field(default_factory=lambda: [30, 60])
+
+@dataclass
+class TrialConfig:
+    optimizer : OptimizerConfig = field(default_factory=OptimizerConfig)
+    epochs : int = 10
+    image_size : Tuple[int, int] = (224, 224)
+
+def test_from_records():
+    records = [{'optimizer': {'lr': 0.01 * i}, 'epochs': i, 'image_size': (i, i)} for i in range(10)]
+    records.append({})
+    cfgs = TrialConfig.from_records(records)
+    assert cfgs == [TrialConfig(**r) for r in records]
+    assert cfgs[0].optimizer.milestones is not cfgs[1].optimizer.milestones
+    with pytest.raises(TypeError):
+        TrialConfig.from_records([{'epochs': 1}, {'epochs': '2'}])
+    with pytest.raises(TypeError):
+        TrialConfig.from_records([{'image_size': (1, '2')}])
+    with pytest.warns(UserWarning):
+        TrialConfig.from_records([{'unknown': 1}])
+
+def test_from_records_not_annotated_fields():
+    @dataclass
+    class AutoConfig:
+        lr : float = 0.1
+        tag = 'base'
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        cfgs = AutoConfig.from_records([{'tag': 'x'}, {}])
+    assert [c.tag for c in cfgs] == ['x', 'base']
+    assert [c.tag for c in AutoConfig.from_records([{'tag': 'y'}])] == ['y']
+
+def test_update_many():
+    cfgs = TrialConfig.from_records([{}, {}, {}])
+    TrialConfig.update_many(cfgs, [{'epochs': 1}, {'optimizer': {'lr': 1.0}}, {'image_size': [1, 1]}])
+    assert cfgs[0].epochs == 1
+    assert cfgs[1].optimizer.lr == 1.0
+    assert cfgs[2].image_size == (1, 1)
+    with pytest.raises(TypeError):
+        TrialConfig.update_many(cfgs, [{}, {}, {'epochs': 'a'}])
+    with pytest.raises(KeyError):
+        TrialConfig.update_many(cfgs, [{}, {}, {'unknown': 1}])
+    # nothing is assigned if a nested value is invalid
+    with pytest.raises(TypeError):
+        TrialConfig.update_many(cfgs, [{'epochs': 5}, {'optimizer': {'lr': 'bad'}}, {}])
+    assert cfgs[0].epochs == 1
+    cfgs[0].freeze()
+    with pytest.raises(FrozenInstanceError):
+        TrialConfig.update_many(cfgs, [{}, {}, {}])
+
+def test_dirty_fields():
+    cfg = TrialConfig()
+    assert cfg.dirty_fields() == []
+    cfg.epochs = 20
+    cfg.optimizer.update(lr=0.01)
+    assert cfg.dirty_fields() == ['optimizer.lr', 'epochs']
+    cfg.optimizer = OptimizerConfig()
+    assert cfg.dirty_fields() == ['optimizer', 'epochs']
+
+def test_save_delta(tmp_path):
+    base = str(tmp_path / 'trial.yaml')
+    log = str(tmp_path / 'trial.delta')
+    cfg = TrialConfig()
+    cfg.save(base)
+    assert cfg.dirty_fields() == []
+    cfg.optimizer.lr = 0.01
+    assert cfg.save_delta(log) == ['optimizer.lr']
+    assert cfg.save_delta(log) == []
+    cfg.image_size = (32, 32)
+    cfg.save_delta(log)
+    with open(log) as f:
+        assert f.read().count('\n...\n') == 2
+    loaded = TrialConfig.load(base, deltas=log)
+    assert loaded == cfg
+    assert loaded.dirty_fields() == []
+    # compaction rewrites base and empties the log
+    cfg.epochs = 1
+    cfg.save_delta(log, base=base, compact_every=3)
+    with open(log) as f:
+        assert f.read() == ''
+    assert TrialConfig.load(base, deltas=log) == cfg
+
+def test_save_delta_nested_types(tmp_path):
+    from typing import Dict
+
+    @dataclass
+    class ScheduleConfig:
+        steps : List[Tuple[int, float]] = field(default_factory=lambda: [(30, 0.1)])
+        weights : Dict[int, float] = field(default_factory=dict)
+        sizes : Tuple[Tuple[int, int], ...] = ((1, 1),)
+
+    base = str(tmp_path / 'schedule.yaml')
+    log = str(tmp_path / 'schedule.delta')
+    cfg = ScheduleConfig()
+    cfg.save(base)
+    cfg.steps = [(60, 0.01)]
+    cfg.weights = {1: 2.0}
+    cfg.save_delta(log)
+    cfg.sizes = ((3, 3), (4, 4))
+    cfg.save_delta(log)
+    # an incomplete patch is not replayed
+    with open(log, 'a') as fo:
+        fo.write('--- {sizes: [')
+    assert ScheduleConfig.load(base, deltas=log) == cfg
+
+def test_save_delta_after_plain_save(tmp_path):
+    base = str(tmp_path / 'trial.yaml')
+    log = str(tmp_path / 'trial.delta')
+    cfg = TrialConfig()
+    cfg.save(base)
+    cfg.optimizer.lr = 0.01
+    cfg.save(str(tmp_path / 'copy.yaml'))
+    assert cfg.save_delta(log) == ['optimizer.lr']
+    assert TrialConfig.load(base, deltas=log).optimizer.lr == 0.01
+
+def test_load_dir(tmp_path):
+    for i in range(6):
+        TrialConfig(epochs=i).save(str(tmp_path / f'trial{i}.yaml'))
+    TrialConfig(epochs=6).save(str(tmp_path / 'trial6.yml'))
+    with open(str(tmp_path / 'broken.yaml'), 'w') as f:
+        f.write('epochs: [1, 2')
+    with open(str(tmp_path / 'invalid.yaml'), 'w') as f:
+        f.write('epochs: ten')
+    for workers in (1, 2):
+        results = list(TrialConfig.load_dir(str(tmp_path), workers=workers))
+        assert [os.path.basename(r.path) for r in results] == \
+            ['broken.yaml', 'invalid.yaml'] + [f'trial{i}.yaml' for i in range(6)] + ['trial6.yml']
+        assert results[0].config is None and results[0].error is not None
+        assert isinstance(results[1].error, TypeError)
+        assert [r.config.epochs for r in results[2:]] == list(range(7))
+    results = list(TrialConfig.load_dir(str(tmp_path / 'trial*.yaml'), workers=2))
+    assert len(results) == 6
+
+def test_async_load_save_update(tmp_path):
+    import asyncio
+    from autocfg.aio import load_many, save_many
+
+    async def main():
+        files = [str(tmp_path / f'trial{i}.yaml') for i in range(8)]
+        await save_many([(TrialConfig(epochs=i), f) for i, f in enumerate(files)], limit=3)
+        cfgs = await load_many(TrialConfig, files, limit=3)
+        assert [c.epochs for c in cfgs] == list(range(8))
+        cfg = await TrialConfig.aload(files[3])
+        await cfg.aupdate(files[5])
+        assert cfg.epochs == 5
+        await cfg.asave(files[0])
+        errors = await load_many(TrialConfig, [files[0], str(tmp_path / 'missing.yaml')], return_exceptions=True)
+        assert errors[0].epochs == 5 and isinstance(errors[1], FileNotFoundError)
+
+    asyncio.run(main())
+
+def test_array_fields(tmp_path):
+    import array
+    np = pytest.importorskip('numpy')
+
+    @dataclass
+    class DetConfig:
+        anchors : AF(np.ndarray, dtype='float32', shape=(None, 4)) = field(
+            default_factory=lambda: np.zeros((3, 4), dtype='float32'))
+        class_weights : array.array = field(default_factory=lambda: array.array('d', [1., 2.]))
+        multipliers : memoryview = field(default_factory=lambda: memoryview(np.arange(5, dtype='int64')))
+        name : str = 'yolo'
+
+    cfg = DetConfig()
+    with pytest.raises(TypeError):
+        cfg.anchors = np.zeros((3, 5), dtype='float32')
+    with pytest.raises(TypeError):
+        cfg.anchors = np.zeros((3, 4), dtype='float64')
+    cfg.anchors = np.arange(8, dtype='float32').reshape(2, 4)
+    f = str(tmp_path / 'det.yaml')
+    cfg.save(f)
+    assert os.path.exists(str(tmp_path / 'det.anchors.npy'))
+    with open(f) as fi:
+        assert 'det.anchors.npy' in fi.read()
+    loaded = DetConfig.load(f)
+    assert isinstance(loaded.anchors, np.memmap)
+    assert (loaded.anchors == cfg.anchors).all()
+    assert loaded.class_weights == cfg.class_weights
+    assert loaded.multipliers.tolist() == [0, 1, 2, 3, 4]
+    assert loaded.name == 'yolo'
+    # saving over the loaded files does not invalidate the mapped arrays
+    loaded.save(f)
+    assert (loaded.anchors == cfg.anchors).all()
+    assert loaded.diff(cfg) == []
+    other = DetConfig()
+    assert [line.split()[0] for line in cfg.diff(other)] == ['root.anchors']
+    import io
+    with pytest.raises(ValueError):
+        cfg.save(io.StringIO())
+
+def test_save_delta_array_fields(tmp_path):
+    np = pytest.importorskip('numpy')
+
+    @dataclass
+    class AnchorConfig:
+        anchors : np.ndarray = field(default_factory=lambda: np.zeros((2, 4)))
+        scale : float = 1.0
+
+    base = str(tmp_path / 'anchor.yaml')
+    log = str(tmp_path / 'anchor.delta')
+    cfg = AnchorConfig()
+    cfg.save(base)
+    cfg.anchors = np.ones((3, 4))
+    assert cfg.save_delta(log) == ['anchors']
+    cfg.anchors = np.full((1, 4), 2.)
+    cfg.scale = 2.
+    cfg.save_delta(log)
+    loaded = AnchorConfig.load(base, deltas=log)
+    assert (loaded.anchors == cfg.anchors).all()
+    assert loaded.scale == 2.
+
+def test_numpy_scalars_are_plain_values(tmp_path):
+    np = pytest.importorskip('numpy')
+    cfg = OptimizerConfig(lr=np.float64(0.01))
+    f = str(tmp_path / 'opt.json')
+    cfg.save(f)
+    assert not list(tmp_path.glob('*.npy'))
+    loaded = OptimizerConfig.load(f)
+    assert loaded.lr == 0.01 and type(loaded.lr) is float
+
+def test_asdict_no_copy_and_iter_items():
+    cfg = TrialConfig()
+    d = cfg.asdict(copy=False)
+    assert d == cfg.asdict()
+    assert d['optimizer']['milestones'] is cfg.optimizer.milestones
+    assert cfg.asdict()['optimizer']['milestones'] is not cfg.optimizer.milestones
+    items = cfg.iter_items()
+    assert next(items) == ('optimizer.name', 'sgd')
+    assert dict(cfg.iter_items()) == {'optimizer.name': 'sgd', 'optimizer.lr': 0.1,
+                                      'optimizer.milestones': [30, 60], 'epochs': 10, 'image_size': (224, 224)}
+    assert [k for k, _ in cfg.iter_items(flat=False)] == ['optimizer', 'epochs', 'image_size']
+
+def test_sub_configs_in_containers(tmp_path):
+    @dataclass
+    class ScheduleConfig:
+        stages : List[OptimizerConfig] = field(default_factory=lambda: [OptimizerConfig(), OptimizerConfig(lr=0.01)])
+        first : List[int] = field(default_factory=lambda: [1, 2])
+        second : List[int] = field(default_factory=lambda: [3])
+
+    cfg = ScheduleConfig()
+    d = cfg.asdict(copy=False)
+    assert d == cfg.asdict()
+    assert d['first'] is cfg.first
+    stages = [{'name': 'sgd', 'lr': 0.1, 'milestones': [30, 60]}, {'name': 'sgd', 'lr': 0.01, 'milestones': [30, 60]}]
+    assert d['stages'] == stages
+    other = ScheduleConfig()
+    other.stages[0].lr = 0.5
+    assert cfg.diff(other) == ['{:<20} {} != {}'.format('root.stages[0].lr', 0.1, 0.5)]
+    cfg.second = cfg.first
+    f = str(tmp_path / 'schedule.json')
+    cfg.save(f)
+    with open(f) as fi:
+        assert json.load(fi)['stages'] == stages
+    f = str(tmp_path / 'schedule.yaml')
+    cfg.save(f)
+    with open(f) as fi:
+        content = fi.read()
+    assert 'python/object' not in content and '&id' not in content
+    assert yaml.safe_load(content) == {'stages': stages, 'first': [1, 2], 'second': [1, 2]}
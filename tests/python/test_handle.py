@@ -0,0 +1,74 @@
+import threading
+import pytest
+from typing import List
+from dataclasses import field
+
+from autocfg import dataclass, FrozenInstanceError
+from autocfg.handle import ConfigHandle
+
+@dataclass
+class DataConfig:
+    root : str = 'data'
+    num_workers : int = 4
+
+@dataclass
+class ModelConfig:
+    depth : int = 50
+    width : int = 50
+
+@dataclass
+class ServeConfig:
+    data : DataConfig = field(default_factory=DataConfig)
+    model : ModelConfig = field(default_factory=ModelConfig)
+    threshold : float = 0.5
+    labels : List[str] = field(default_factory=list)
+
+def test_structural_sharing():
+    cfg = ServeConfig()
+    handle = ConfigHandle(cfg)
+    old = handle.snapshot()
+    new = handle.update({'model': {'depth': 101}, 'threshold': 0.7})
+    assert handle.snapshot() is new and handle.version == 1
+    assert new.model.depth == 101 and new.threshold == 0.7
+    assert old.model.depth == 50 and old.threshold == 0.5
+    assert new.data is old.data
+    assert cfg.model.depth == 50
+    with pytest.raises(FrozenInstanceError):
+        new.threshold = 1.0
+    with pytest.raises(FrozenInstanceError):
+        new.model.depth = 1
+    with pytest.raises(TypeError):
+        handle.update(threshold='high')
+    with pytest.raises(KeyError):
+        handle.update(unknown=1)
+    assert handle.snapshot() is new
+
+def test_consistent_reads():
+    handle = ConfigHandle(ServeConfig())
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            snap = handle.snapshot()
+            if snap.model.depth != snap.model.width:
+                errors.append((snap.model.depth, snap.model.width))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for t in readers:
+        t.start()
+    for i in range(200):
+        handle.update({'model': {'depth': i, 'width': i}})
+    stop.set()
+    for t in readers:
+        t.join()
+    assert not errors
+    assert handle.version == 200
+
+def test_mutable_values_copied():
+    handle = ConfigHandle(ServeConfig())
+    labels = ['cat', 'dog']
+    snap = handle.update(labels=labels)
+    labels.append('bird')
+    assert snap.labels == ['cat', 'dog']
+    assert snap.labels is not labels
@@ -0,0 +1,56 @@
+import gc
+from typing import Tuple, List
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg.intern import InternTable, intern_config
+
+@dataclass
+class DataConfig:
+    root : str = '~/.datasets/imagenet'
+    mean : Tuple[float, float, float] = (0.485, 0.456, 0.406)
+
+@dataclass
+class AugConfig:
+    ops : List[str] = field(default_factory=lambda: ['flip', 'crop'])
+
+@dataclass
+class TrialConfig:
+    data : DataConfig = field(default_factory=DataConfig)
+    aug : AugConfig = field(default_factory=AugConfig)
+    lr : float = 0.1
+    image_size : Tuple[int, int] = (224, 224)
+
+def _make(lr):
+    cfg = TrialConfig(lr=lr, image_size=tuple([224, 224]))
+    cfg.data.freeze()
+    cfg.aug.freeze()
+    return cfg
+
+def test_share_frozen_subconfigs():
+    table = InternTable()
+    cfgs = [intern_config(_make(0.1 * i), table) for i in range(5)]
+    assert all(c.data is cfgs[0].data for c in cfgs)
+    assert all(c.image_size is cfgs[0].image_size for c in cfgs)
+    # lists are mutable, configs holding them are never shared
+    assert cfgs[0].aug is not cfgs[1].aug
+    # unfrozen configs are never shared
+    assert cfgs[0] is not cfgs[1]
+    assert cfgs[1] == _make(0.1)
+    assert table.info()['hits'] > 0
+
+def test_types_not_confused():
+    table = InternTable()
+    assert table.intern((1, 2)) is table.intern((1, 2))
+    assert type(table.intern((1.0, 2))[0]) is float
+
+def test_weak_configs_and_purge():
+    table = InternTable()
+    cfgs = [intern_config(_make(0.1), table) for i in range(3)]
+    assert table.info()['configs'] == 1
+    del cfgs
+    gc.collect()
+    assert table.info()['configs'] == 0
+    assert table.purge() == 1
+    # the default `mean` is still referenced by the class
+    assert table.info()['leaves'] == 1
@@ -0,0 +1,78 @@
+import pytest
+from typing import Tuple
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg.layered import resolve, FileSource, EnvSource, CliSource, DictSource
+
+@dataclass
+class OptimizerConfig:
+    name : str = 'sgd'
+    lr : float = 0.1
+
+@dataclass
+class TrialConfig:
+    optimizer : OptimizerConfig = field(default_factory=OptimizerConfig)
+    batch_size : int = 32
+    image_size : Tuple[int, int] = (224, 224)
+
+def test_resolve_layers(tmpdir):
+    base = str(tmpdir.join('base.yml'))
+    with open(base, 'w') as f:
+        f.write('optimizer:\n  name: adam\n  lr: 0.01\nbatch_size: 64\n')
+    override = str(tmpdir.join('override.yml'))
+    with open(override, 'w') as f:
+        f.write('optimizer:\n  lr: 0.001\n')
+    env = {'TRIAL_BATCH_SIZE': '128', 'TRIAL_IMAGE_SIZE': '[320, 320]', 'OTHER_BATCH_SIZE': '1'}
+    cfg, provenance = TrialConfig.resolve([
+        base, override, EnvSource('TRIAL_', environ=env), CliSource(['--optimizer.lr', '0.5'])])
+    assert cfg.optimizer.name == 'adam'
+    assert cfg.optimizer.lr == 0.5
+    assert cfg.batch_size == 128
+    assert cfg.image_size == (320, 320)
+    assert provenance == {'optimizer.name': base, 'optimizer.lr': 'cli', 'batch_size': 'env:TRIAL_',
+                          'image_size': 'env:TRIAL_'}
+
+def test_resolve_defaults():
+    cfg, provenance = resolve(TrialConfig, [{'optimizer': {'name': 'adam'}}, CliSource([])])
+    assert cfg == TrialConfig(optimizer=OptimizerConfig(name='adam'))
+    assert provenance['optimizer.name'] == 'dict'
+    assert provenance['optimizer.lr'] == provenance['batch_size'] == 'default'
+
+def test_resolve_validates():
+    with pytest.raises(TypeError):
+        resolve(TrialConfig, [DictSource({'batch_size': 1}), EnvSource('T_', environ={'T_BATCH_SIZE': 'x'})])
+    with pytest.raises(FileNotFoundError):
+        resolve(TrialConfig, [FileSource('not_exist.yml')])
+
+def test_resolve_file_array_fields(tmp_path):
+    np = pytest.importorskip('numpy')
+
+    @dataclass
+    class AnchorConfig:
+        anchors : np.ndarray = field(default_factory=lambda: np.zeros((2, 4)))
+        scale : float = 1.0
+
+    path = str(tmp_path / 'anchor.yaml')
+    AnchorConfig(anchors=np.ones((2, 4))).save(path)
+    cfg, provenance = AnchorConfig.resolve([path, {'scale': 2.}])
+    assert (cfg.anchors == 1).all() and cfg.scale == 2.
+    assert provenance == {'anchors': path, 'scale': 'dict'}
+
+def test_env_scalars():
+    env = {'T_OPTIMIZER__LR': '1e-3', 'T_BATCH_SIZE': '16'}
+    cfg, _ = resolve(TrialConfig, [EnvSource('T_', environ=env)])
+    assert cfg.optimizer.lr == 1e-3 and cfg.batch_size == 16
+    cfg, _ = resolve(TrialConfig, [EnvSource('T_', environ={'T_OPTIMIZER__LR': '1'})])
+    assert cfg.optimizer.lr == 1.0 and isinstance(cfg.optimizer.lr, float)
+    with pytest.raises(TypeError):
+        resolve(TrialConfig, [EnvSource('T_', environ={'T_OPTIMIZER__LR': 'fast'})])
+
+def test_resolve_config_instances():
+    mine = OptimizerConfig(name='adam')
+    cfg, provenance = resolve(TrialConfig, [DictSource({'optimizer': mine}, name='mine'), {'optimizer': {'lr': 0.9}}])
+    assert mine.lr == 0.1
+    assert cfg.optimizer is not mine
+    assert cfg.optimizer == OptimizerConfig(name='adam', lr=0.9)
+    assert provenance == {'optimizer.name': 'mine', 'optimizer.lr': 'dict', 'batch_size': 'default',
+                          'image_size': 'default'}
@@ -0,0 +1,69 @@
+import pytest
+from typing import Tuple, List
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg import AnnotateField as AF
+
+np = pytest.importorskip('numpy')
+
+@dataclass
+class OptimizerConfig:
+    name : AF(str, choices=('sgd', 'adam')) = 'sgd'
+    lr : AF(float, low=1e-5, high=1e-1, log=True) = 0.1
+    momentum : AF(float, low=0.8, high=0.99) = 0.9
+
+@dataclass
+class TrialConfig:
+    optimizer : OptimizerConfig = field(default_factory=OptimizerConfig)
+    batch_size : AF(int, low=16, high=64) = 32
+    image_size : AF(Tuple[int, int], choices=((224, 224), (320, 320))) = (224, 224)
+    milestones : List[int] = field(default_factory=lambda: [30, 60])
+
+def test_sample_instances():
+    cfgs = TrialConfig.sample(200, seed=0)
+    assert len(cfgs) == 200
+    assert {c.optimizer.name for c in cfgs} == {'sgd', 'adam'}
+    assert all(1e-5 <= c.optimizer.lr <= 1e-1 for c in cfgs)
+    assert all(16 <= c.batch_size <= 64 and isinstance(c.batch_size, int) for c in cfgs)
+    assert {c.image_size for c in cfgs} == {(224, 224), (320, 320)}
+    assert cfgs[0].milestones == [30, 60]
+    assert cfgs[0].milestones is not cfgs[1].milestones
+    # sampled configs behave like constructed ones
+    cfgs[0].batch_size = 20
+    with pytest.raises(TypeError):
+        cfgs[0].batch_size = 'a'
+    assert TrialConfig.sample(5, seed=1) == TrialConfig.sample(5, seed=1)
+
+def test_sample_columns():
+    store = TrialConfig.sample(100, seed=0, as_columns=True)
+    assert len(store) == 100
+    assert store['optimizer.lr'].dtype == np.float64
+    assert isinstance(store[0], TrialConfig)
+
+def test_invalid_space():
+    @dataclass
+    class Bad:
+        name : AF(str, choices=('a', 1)) = 'a'
+    with pytest.raises(TypeError):
+        Bad.sample(3)
+
+def test_mutable_choices_not_shared():
+    @dataclass
+    class ScheduleConfig:
+        milestones : AF(List[int], choices=([1, 2], [3, 4])) = field(default_factory=lambda: [1, 2])
+
+    cfgs = ScheduleConfig.sample(5, seed=0)
+    cfgs[0].milestones.append(99)
+    assert sum(99 in c.milestones for c in cfgs) == 1
+
+def test_removed_fields_not_sampled():
+    @dataclass(version='1.0')
+    class VersionedConfig:
+        lr : AF(float, low=0.1, high=0.2) = 0.1
+        gone : AF(int, deleted='0.5') = 1
+        later : AF(int, added='2.0') = 1
+
+    cfgs = VersionedConfig.sample(3, seed=0)
+    assert not any('gone' in vars(c) or 'later' in vars(c) for c in cfgs)
+    assert 'gone' not in VersionedConfig.sample(3, seed=0, as_columns=True).names
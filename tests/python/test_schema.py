@@ -0,0 +1,76 @@
+import warnings
+from typing import Tuple, List, Dict, Optional
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg import AnnotateField as AF
+from autocfg.schema import compile_schema
+
+@dataclass
+class OptimizerConfig:
+    name : AF(str, choices=('sgd', 'adam')) = 'sgd'
+    lr : AF(float, low=1e-5, high=1e-1) = 0.1
+
+@dataclass(version='1.0')
+class TrialConfig:
+    optimizer : OptimizerConfig
+    image_size : Tuple[int, int] = (224, 224)
+    milestones : List[int] = field(default_factory=lambda: [30, 60])
+    tags : Dict[str, Optional[str]] = field(default_factory=dict)
+    old_size : AF(int, deprecated='0.5') = 1
+    gone_size : AF(int, deleted='0.8') = 1
+    new_size : AF(int, added='2.0') = 1
+
+def test_validate_dict():
+    assert TrialConfig.validate_dict({'optimizer': {'name': 'adam'}, 'image_size': (320, 320)}) == []
+    errors = TrialConfig.validate_dict({'optimizer': {'lr': 'fast'}, 'image_size': [320, 320],
+                                        'milestones': [1, 'x'], 'unknown': 1})
+    assert len(errors) == 3
+    assert errors[0].startswith('optimizer.lr:')
+    assert errors[1].startswith('image_size:')
+    assert errors[2].startswith('milestones:')
+    assert TrialConfig.validate_dict({'optimizer': {}, 'unknown': 1}, strict=True) == \
+        [f'unknown: unexpected key in {TrialConfig}']
+    assert TrialConfig.validate_dict({}) == ['optimizer: missing required field']
+    assert TrialConfig.validate_dict({'optimizer': OptimizerConfig()}) == []
+
+def test_validate_dict_versions():
+    assert TrialConfig.validate_dict({'optimizer': {}, 'old_size': 2}) == []
+    errors = TrialConfig.validate_dict({'optimizer': {}, 'gone_size': 2, 'new_size': 2})
+    assert len(errors) == 2
+    assert 'deleted in 0.8' in errors[0]
+    assert 'not added' in errors[1]
+
+def test_validate_dict_agrees_with_construction():
+    records = [{'optimizer': {'name': 'adam'}, 'milestones': [1]},
+               {'optimizer': {}, 'milestones': ['a']},
+               {'optimizer': {'lr': 1}, 'image_size': (1, 2, 3)}]
+    for r in records:
+        valid = not TrialConfig.validate_dict(r)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                TrialConfig(**r)
+            constructed = True
+        except (TypeError, KeyError):
+            constructed = False
+        assert valid == constructed
+
+def test_compile_schema_cached():
+    assert compile_schema(TrialConfig) is compile_schema(TrialConfig)
+    assert 'gone_size' not in compile_schema(TrialConfig).fields
+
+def test_json_schema():
+    schema = TrialConfig.json_schema()
+    assert schema['$schema'].startswith('https://json-schema.org/')
+    assert schema['required'] == ['optimizer']
+    props = schema['properties']
+    # search spaces are not enforced by validation, so not exported
+    assert props['optimizer']['properties']['name'] == {'type': 'string', 'default': 'sgd'}
+    assert 'minimum' not in props['optimizer']['properties']['lr']
+    assert TrialConfig.validate_dict({'optimizer': {'name': 'rmsprop', 'lr': 1.0}}) == []
+    assert props['image_size']['prefixItems'] == [{'type': 'integer'}, {'type': 'integer'}]
+    assert props['milestones'] == {'type': 'array', 'items': {'type': 'integer'}}
+    assert props['tags']['additionalProperties'] == {'anyOf': [{'type': 'string'}, {'type': 'null'}]}
+    assert props['old_size']['deprecated'] is True
+    assert props['gone_size'] is False and props['new_size'] is False
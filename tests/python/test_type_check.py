@@ -0,0 +1,106 @@
+import gc
+import pytest
+from typing import Callable, Type, List, Tuple, Union, FrozenSet
+
+from autocfg import type_check
+from autocfg.type_check import is_instance, is_subtype, compile_check, cache_info, clear_caches
+
+class Base:
+    pass
+
+class Derived(Base):
+    pass
+
+def relu(x: float) -> float:
+    return max(x, 0.)
+
+def test_callable_check_cached():
+    clear_caches()
+    assert is_instance(relu, Callable[[float], float])
+    assert not is_instance(relu, Callable[[str], float])
+    misses = cache_info()['callable']['misses']
+    for _ in range(10):
+        assert is_instance(relu, Callable[[float], float])
+    info = cache_info()
+    assert info['callable']['misses'] == misses
+    assert info['callable']['hits'] >= 10
+    assert info['signature']['size'] == 1
+
+def test_missing_annotations_not_cached():
+    def f(x):
+        return x
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            is_instance(f, Callable[[int], int])
+
+def test_subtype_cached_and_weak():
+    clear_caches()
+    assert is_instance(Derived, Type[Base])
+    assert is_subtype(Derived, Base)
+    assert cache_info()['subtype']['hits'] == 1
+
+    def make():
+        class Temp(Base):
+            pass
+        return Temp
+    temp = make()
+    assert is_subtype(temp, Base)
+    size = cache_info()['subtype']['size']
+    del temp
+    gc.collect()
+    assert cache_info()['subtype']['size'] == size - 1
+
+def test_cache_bounded(monkeypatch):
+    monkeypatch.setattr(type_check._SUBTYPE_CACHE, 'maxsize', 4)
+    classes = [type(f'C{i}', (Base,), {}) for i in range(10)]
+    for klass in classes:
+        assert is_subtype(klass, Base)
+    assert cache_info()['subtype']['size'] <= 4
+
+def test_immutable_values_memoized():
+    clear_caches()
+    schedule = ((30, 0.1), (60, 0.01))
+    type_ = Tuple[Tuple[int, float], Tuple[int, float]]
+    assert is_instance(schedule, type_)
+    misses = cache_info()['instance']['misses']
+    for _ in range(10):
+        assert is_instance(schedule, type_)
+        assert is_instance('name', Union[str, int])
+    info = cache_info()['instance']
+    assert info['misses'] == misses + 1
+    assert info['hits'] >= 19
+    assert 0 < info['hit_rate'] <= 1
+    # equal but not identical values are checked again
+    assert not is_instance(((30, 0.1), (60, '0.01')), type_)
+    assert is_instance(1.0, Union[str, float]) and not is_instance(1, Union[str, float])
+
+def test_mutable_values_not_memoized():
+    clear_caches()
+    values = [1, 2]
+    assert is_instance(values, List[int])
+    values.append('x')
+    assert not is_instance(values, List[int])
+    assert is_instance((1, [2]), Tuple[int, List[int]])
+    assert cache_info()['instance']['size'] == 0
+
+def test_compiled_check_memoized():
+    clear_caches()
+    check = compile_check(FrozenSet[int])
+    value = frozenset((1, 2))
+    assert check(value) and check(value)
+    assert not check(frozenset(('a',)))
+    assert cache_info()['instance']['hits'] == 1
+
+def test_elements_not_memoized():
+    clear_caches()
+    values = list(range(100))
+    assert is_instance(values, List[Union[int, str]])
+    assert compile_check(List[Union[int, str]])(values)
+    info = cache_info()['instance']
+    assert info['size'] == 0 and info['misses'] == 0
+
+def test_variadic_tuple():
+    type_ = Tuple[Tuple[int, int], ...]
+    assert is_instance(((1, 1), (2, 2), (3, 3)), type_) and is_instance((), type_)
+    assert not is_instance(((1, 1), (2, '2')), type_)
+    assert compile_check(type_)(((1, 1),)) and not compile_check(type_)([(1, 1)])
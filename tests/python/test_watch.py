@@ -0,0 +1,84 @@
+import os
+import time
+import pytest
+from typing import Tuple
+from dataclasses import field
+
+from autocfg import dataclass
+from autocfg.handle import ConfigHandle
+from autocfg.watch import ConfigWatcher
+
+@dataclass
+class OptimizerConfig:
+    lr : float = 0.1
+    momentum : float = 0.9
+
+@dataclass
+class TrainConfig:
+    optimizer : OptimizerConfig = field(default_factory=OptimizerConfig)
+    epochs : int = 10
+    image_size : Tuple[int, int] = (224, 224)
+
+def _write(path, cfg, mtime):
+    cfg.save(path)
+    os.utime(path, ns=(mtime, mtime))
+
+def test_apply_changed_keys(tmp_path):
+    path = str(tmp_path / 'train.yaml')
+    cfg = TrainConfig()
+    _write(path, cfg, 1)
+    watcher = ConfigWatcher(cfg, path)
+    calls = []
+    watcher.on_change(lambda *args: calls.append(args), path='optimizer')
+    assert watcher.check() == {}
+
+    _write(path, TrainConfig(optimizer=OptimizerConfig(lr=0.01)), 2)
+    changes = watcher.check()
+    assert changes == {'optimizer.lr': (0.1, 0.01)}
+    assert cfg.optimizer.lr == 0.01
+    assert calls == [('optimizer.lr', 0.1, 0.01)]
+    # unchanged file is not parsed again
+    assert watcher.check() == {}
+
+def test_json_and_handle(tmp_path):
+    path = str(tmp_path / 'train.json')
+    handle = ConfigHandle(TrainConfig())
+    _write(path, TrainConfig(), 1)
+    watcher = ConfigWatcher(handle, path)
+    watcher.check(force=True)
+    # lists in json equal tuples of the config
+    assert handle.version == 0
+    _write(path, TrainConfig(epochs=20), 2)
+    assert watcher.check() == {'epochs': (10, 20)}
+    assert handle.snapshot().epochs == 20
+
+def test_background_polling(tmp_path):
+    path = str(tmp_path / 'train.yaml')
+    cfg = TrainConfig()
+    _write(path, cfg, 1)
+    with ConfigWatcher(cfg, path, interval=0.01):
+        _write(path, TrainConfig(epochs=30), 2)
+        for _ in range(200):
+            if cfg.epochs == 30:
+                break
+            time.sleep(0.01)
+    assert cfg.epochs == 30
+
+def test_array_fields(tmp_path):
+    np = pytest.importorskip('numpy')
+
+    @dataclass
+    class AnchorConfig:
+        anchors : np.ndarray = field(default_factory=lambda: np.zeros((2, 4)))
+        scale : float = 1.0
+
+    path = str(tmp_path / 'anchor.yaml')
+    cfg = AnchorConfig()
+    _write(path, cfg, 1)
+    watcher = ConfigWatcher(cfg, path)
+    assert watcher.check(force=True) == {}
+    _write(path, AnchorConfig(scale=2.), 2)
+    assert list(watcher.check()) == ['scale']
+    _write(path, AnchorConfig(anchors=np.ones((2, 4)), scale=2.), 3)
+    assert list(watcher.check()) == ['anchors']
+    assert (cfg.anchors == 1).all()